@@ -0,0 +1,1017 @@
+#!/usr/bin/env python3
+import argparse
+import json
+import math
+import os
+import platform
+import queue
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict, deque, namedtuple
+from fnmatch import fnmatch
+
+from Cache import LFUCache, LRUCache, TTLCache
+from GraphAnalytics import GraphAnalytics
+from Instrumentation import Instrumentation
+from LinkedList import (ConcurrentDoublyLinkedList, Deque, DoublyLinkedList, IndexableSkipList,
+                        IndexedDoublyLinkedList, PersistentList, PooledLinkedList, SinglyLinkedList,
+                        UnrolledLinkedList)
+from ShortestPath import ShortestPaths
+from SimpleGraph import CSRGraph, SimpleGraph, iterEdgeFile
+
+
+class DictNode:
+    # the node layout LinkedList.py used before nodes were slotted
+    def __init__(self, key=None, nextNode=None, previousNode=None):
+        self.key = key
+        self.next = nextNode
+        self.prev = previousNode
+
+
+def buildDictNodeChain(keys):
+    head = None
+    for key in keys:
+        head = DictNode(key, head)
+    return head
+
+
+def buildList(listClass, keys):
+    newList = listClass()
+    newList.makeList(keys)
+    return newList
+
+
+def copyingMergeSort(linkedList):
+    # the recursive mergeSort LinkedList.py used before sorting in place:
+    # every level splits into new lists and merges into a reversed copy
+    if linkedList.head is None or linkedList.head.next is None:
+        return linkedList
+    middleNode = linkedList.getMiddleNode()
+    rightHead = middleNode.next
+    middleNode.next = None
+    left = copyingMergeSort(SinglyLinkedList(linkedList.head))
+    right = copyingMergeSort(SinglyLinkedList(rightHead))
+    firstListNode, secondListNode = left.head, right.head
+    mergedList = SinglyLinkedList()
+    while firstListNode and secondListNode:
+        if firstListNode.key <= secondListNode.key:
+            mergedList.insertAtBeginning(firstListNode.key)
+            firstListNode = firstListNode.next
+        else:
+            mergedList.insertAtBeginning(secondListNode.key)
+            secondListNode = secondListNode.next
+    for remainingNode in (firstListNode, secondListNode):
+        while remainingNode:
+            mergedList.insertAtBeginning(remainingNode.key)
+            remainingNode = remainingNode.next
+    return mergedList.getReverseList()
+
+
+def timeIt(func, repeat=3):
+    best = float('inf')
+    for i in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmarkMakeList(sizes=(10**3, 10**4, 10**5, 2 * 10**5)):
+    print("Bulk construction with makeList (time per element should stay flat):")
+    print("{:<18}{:>10}{:>12}{:>12}".format("class", "n", "total (s)", "ns/elem"))
+    for listClass in (SinglyLinkedList, DoublyLinkedList):
+        for n in sizes:
+            elapsed = timeIt(lambda: listClass().makeList(range(n)))
+            print("{:<18}{:>10}{:>12.4f}{:>12.1f}".format(
+                listClass.__name__, n, elapsed, elapsed / n * 1e9))
+
+
+def measureMemory(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def benchmarkMemory(n=10**5):
+    # the keys are allocated up front so only the per-element container
+    # overhead is measured
+    keys = list(range(n))
+    print("Memory per element for {} elements:".format(n))
+    builders = (
+        ("dict Node (old)", lambda: buildDictNodeChain(keys)),
+        ("SinglyLinkedList", lambda: buildList(SinglyLinkedList, keys)),
+        ("DoublyLinkedList", lambda: buildList(DoublyLinkedList, keys)),
+        ("PooledLinkedList", lambda: buildList(PooledLinkedList, keys)),
+    )
+    for name, build in builders:
+        print("{:<18}{:>10.1f} bytes".format(name, measureMemory(build) / n))
+
+
+def benchmarkMergeSort(n=10**5):
+    inputs = (
+        ("random", random.Random(0).sample(range(n), n)),
+        ("presorted", list(range(n))),
+        ("reversed", list(range(n, 0, -1))),
+    )
+    print("Sorting {} keys (seconds):".format(n))
+    print("{:<12}{:>14}{:>14}{:>14}".format("input", "copying", "in-place", "sorted()"))
+    for name, keys in inputs:
+        copying = timeIt(lambda: copyingMergeSort(buildList(SinglyLinkedList, keys)), repeat=1)
+        inPlace = timeIt(lambda: buildList(SinglyLinkedList, keys).mergeSort(), repeat=1)
+        builtin = timeIt(lambda: sorted(keys), repeat=1)
+        build = timeIt(lambda: buildList(SinglyLinkedList, keys), repeat=1)
+        print("{:<12}{:>14.4f}{:>14.4f}{:>14.4f}".format(
+            name, copying - build, inPlace - build, builtin))
+
+
+def positionalEdits(linkedList, operations, rng):
+    for i in range(operations):
+        index = rng.randrange(len(linkedList))
+        linkedList.insertAtIndex(i, index)
+        linkedList.updateAtIndex(index, -i)
+        linkedList.deleteAtIndex(rng.randrange(len(linkedList)))
+
+
+def benchmarkPositionalEdits(sizes=(10**4, 10**5, 10**6), operations=2000):
+    # the walking list is only run where it finishes in reasonable time
+    print("Random insert/update/delete at an index (microseconds per round):")
+    print("{:<20}{:>10}{:>14}".format("class", "n", "us/round"))
+    for listClass, maxSize in ((DoublyLinkedList, 10**5), (IndexableSkipList, 10**6)):
+        for n in sizes:
+            if n > maxSize:
+                continue
+            linkedList = buildList(listClass, range(n))
+            elapsed = timeIt(lambda: positionalEdits(linkedList, operations, random.Random(0)), repeat=1)
+            print("{:<20}{:>10}{:>14.1f}".format(listClass.__name__, n, elapsed / operations * 1e6))
+
+
+def benchmarkScans(n=10**6):
+    keys = list(range(n))
+    print("Full scans over {} keys (seconds) and memory per element:".format(n))
+    print("{:<20}{:>10}{:>10}{:>10}{:>10}{:>12}".format(
+        "class", "getIndex", "isSorted", "isEqual", "iterate", "bytes/elem"))
+    for listClass in (SinglyLinkedList, UnrolledLinkedList):
+        first, second = buildList(listClass, keys), buildList(listClass, keys)
+        print("{:<20}{:>10.4f}{:>10.4f}{:>10.4f}{:>10.4f}{:>12.1f}".format(
+            listClass.__name__,
+            timeIt(lambda: first.getIndex(-1)),
+            timeIt(first.isSorted),
+            timeIt(lambda: first.isEqual(second)),
+            timeIt(lambda: sum(first)),
+            measureMemory(lambda: buildList(listClass, keys)) / n))
+
+
+def repeatedRotations(linkedList, rotations, k):
+    for i in range(rotations):
+        linkedList.rotate(k)
+
+
+def benchmarkCopyAndReverse(n=10**6):
+    keys = list(range(n))
+    print("Copying and reversing {} keys (seconds) and copy memory per element:".format(n))
+    print("{:<20}{:>18}{:>10}{:>16}{:>10}{:>18}{:>12}".format(
+        "class", "getDuplicateList", "copy", "getReverseList", "reverse", "reverse+iterate", "bytes/elem"))
+    for listClass in (SinglyLinkedList, DoublyLinkedList):
+        linkedList = buildList(listClass, keys)
+        print("{:<20}{:>18.4f}{:>10.4f}{:>16.4f}{:>10.4f}{:>18.4f}{:>12.1f}".format(
+            listClass.__name__,
+            timeIt(linkedList.getDuplicateList),
+            timeIt(linkedList.copy),
+            timeIt(linkedList.getReverseList),
+            timeIt(linkedList.reverse),
+            timeIt(lambda: (linkedList.reverse(), sum(linkedList))),
+            measureMemory(linkedList.copy) / n))
+
+
+def prependAll(keys):
+    # every prepend makes a new version; only the latest one is kept
+    persistentList = PersistentList()
+    for key in keys:
+        persistentList = persistentList.insertAtBeginning(key)
+    return persistentList
+
+
+def copyingSnapshots(keys, updates):
+    linkedList = buildList(SinglyLinkedList, keys)
+    snapshots = list()
+    for i in range(updates):
+        linkedList.insertAtBeginning(i)
+        snapshots.append(linkedList.getDuplicateList())
+    return snapshots
+
+
+def persistentSnapshots(keys, updates):
+    persistentList = PersistentList().extend(keys)
+    snapshots = list()
+    for i in range(updates):
+        persistentList = persistentList.insertAtBeginning(i)
+        snapshots.append(persistentList.snapshot())
+    return snapshots
+
+
+def benchmarkSnapshots(n=10**4, updates=200):
+    keys = list(range(n))
+    print("A snapshot after each of {} prepends to {} keys:".format(updates, n))
+    print("{:<20}{:>12}{:>16}".format("class", "seconds", "retained MB"))
+    for listClass, takeSnapshots in ((SinglyLinkedList, copyingSnapshots), (PersistentList, persistentSnapshots)):
+        print("{:<20}{:>12.4f}{:>16.2f}".format(
+            listClass.__name__, timeIt(lambda: takeSnapshots(keys, updates), repeat=1),
+            measureMemory(lambda: takeSnapshots(keys, updates)) / 2**20))
+
+
+def benchmarkRotations(sizes=(10**3, 10**4, 10**5), rotations=10**4):
+    print("Repeated small rotations (microseconds per rotation):")
+    print("{:<20}{:>10}{:>12}{:>12}".format("class", "n", "rotate(1)", "rotate(-1)"))
+    for listClass in (SinglyLinkedList, DoublyLinkedList):
+        for n in sizes:
+            linkedList = buildList(listClass, range(n))
+            right = timeIt(lambda: repeatedRotations(linkedList, rotations, 1), repeat=1)
+            left = timeIt(lambda: repeatedRotations(linkedList, rotations, -1), repeat=1)
+            print("{:<20}{:>10}{:>12.2f}{:>12.2f}".format(
+                listClass.__name__, n, right / rotations * 1e6, left / rotations * 1e6))
+
+
+def runWorkQueue(put, get, producers, consumers, itemsPerProducer, reader=None):
+    consumed = [list() for i in range(consumers)]
+
+    def produce(base):
+        for i in range(itemsPerProducer):
+            put(base + i)
+
+    def consume(keys):
+        while True:
+            key = get()
+            if key is None:
+                return
+            keys.append(key)
+
+    stop = threading.Event()
+    workers = [threading.Thread(target=produce, args=(p * itemsPerProducer,)) for p in range(producers)]
+    workers += [threading.Thread(target=consume, args=(keys,)) for keys in consumed]
+    readers = list()
+    if reader is not None:
+        readers.append(threading.Thread(target=reader, args=(stop,)))
+    start = time.perf_counter()
+    for thread in workers + readers:
+        thread.start()
+    for thread in workers[:producers]:
+        thread.join()
+    for i in range(consumers):
+        put(None)
+    for thread in workers[producers:]:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    for thread in readers:
+        thread.join()
+    keys = sorted(key for keys in consumed for key in keys)
+    if keys != list(range(producers * itemsPerProducer)):
+        raise AssertionError("items were lost or consumed twice")
+    return elapsed
+
+
+def benchmarkConcurrentQueue(producers=4, consumers=4, itemsPerProducer=25000):
+    # doubles as a stress test: every item has to come out exactly once while
+    # a reader keeps walking, indexing and snapshotting the list without
+    # taking the lock
+    workQueue = ConcurrentDoublyLinkedList()
+
+    def read(stop):
+        while not stop.is_set():
+            for key in workQueue:
+                pass
+            size = len(workQueue)
+            try:
+                workQueue[size // 2]
+                workQueue[size - 1]
+            except IndexError:
+                pass  # the consumers emptied the list in between
+            workQueue.getMiddleNode()
+            workQueue.snapshot()
+
+    total = producers * itemsPerProducer
+    readingTime = runWorkQueue(workQueue.insertAtEnd, workQueue.popAtBeginning,
+                               producers, consumers, itemsPerProducer, read)
+    listTime = runWorkQueue(workQueue.insertAtEnd, workQueue.popAtBeginning,
+                            producers, consumers, itemsPerProducer)
+    standardQueue = queue.Queue()
+    queueTime = runWorkQueue(standardQueue.put, standardQueue.get,
+                             producers, consumers, itemsPerProducer)
+    print("Work queue with {} producers, {} consumers and {} items (items/s):".format(
+        producers, consumers, total))
+    print("{:<40}{:>12.0f}".format("ConcurrentDoublyLinkedList + reader", total / readingTime))
+    print("{:<40}{:>12.0f}".format("ConcurrentDoublyLinkedList", total / listTime))
+    print("{:<40}{:>12.0f}".format("queue.Queue", total / queueTime))
+
+
+def randomEdgeList(vertices, edges, seed=0):
+    rng = random.Random(seed)
+    return [(rng.randrange(vertices), rng.randrange(vertices)) for i in range(edges)]
+
+
+def buildGraph(edgeList, directed=False):
+    graph = SimpleGraph(directed)
+    graph.fromEdgeList(edgeList)
+    return graph
+
+
+def benchmarkGraphLayouts(vertices=2 * 10**4, edges=10**5):
+    edgeList = randomEdgeList(vertices, edges)
+    graph = buildGraph(edgeList)
+    csrGraph = CSRGraph.fromEdgeList(edgeList)
+    print("Undirected graph with {} vertices and {} edges:".format(vertices, edges))
+    print("{:<14}{:>14}{:>10}{:>10}{:>14}".format(
+        "layout", "bytes/edge", "bfs (s)", "dfs (s)", "components"))
+    for name, build, target in (("SimpleGraph", lambda: buildGraph(edgeList), graph),
+                                ("CSRGraph", lambda: CSRGraph.fromEdgeList(edgeList), csrGraph)):
+        print("{:<14}{:>14.1f}{:>10.3f}{:>10.3f}{:>14.3f}".format(
+            name, measureMemory(build) / edges,
+            timeIt(lambda: target.bfs('0'), repeat=1),
+            timeIt(lambda: target.dfs('0'), repeat=1),
+            timeIt(lambda: target.connectedComponents, repeat=1)))
+
+
+def benchmarkTraversals(sizes=(10**4, 10**5, 2 * 10**5), degree=5):
+    # SimpleGraph.bfs used list.pop(0) and set differences that never removed
+    # anything; time per edge should now stay roughly flat as the graph grows
+    print("SimpleGraph traversals with {} edges per vertex (ns per edge):".format(degree))
+    print("{:>10}{:>10}{:>10}{:>12}{:>22}".format("vertices", "bfs", "dfs", "components", "iterBfs to d=2 (s)"))
+    for n in sizes:
+        graph = buildGraph(randomEdgeList(n, degree * n))
+        edges = degree * n
+        print("{:>10}{:>10.0f}{:>10.0f}{:>12.0f}{:>22.5f}".format(
+            n,
+            timeIt(lambda: graph.bfs('0'), repeat=1) / edges * 1e9,
+            timeIt(lambda: graph.dfs('0'), repeat=1) / edges * 1e9,
+            timeIt(lambda: graph.connectedComponents, repeat=1) / edges * 1e9,
+            timeIt(lambda: next(step for step in graph.iterBfs('0') if step[1] == 2), repeat=1)))
+
+
+def traversalComponentCount(graph):
+    # how components were counted before the union-find: a search from every unvisited vertex
+    visited = bytearray(len(graph.vertexSet))
+    count = 0
+    for vertexObject in graph._vertexDict.values():
+        if not visited[vertexObject.id]:
+            count += 1
+            for step in graph._iterBfs(vertexObject, visited):
+                pass
+    return count
+
+
+def benchmarkIncrementalComponents(vertices=10**5, edges=2 * 10**5, queryEvery=1000):
+    # a live graph taking edge inserts, asking for the component count and a
+    # sameComponent check after every batch
+    edgeList = randomEdgeList(vertices, edges)
+    rng = random.Random(0)
+    queries = [(str(rng.randrange(vertices)), str(rng.randrange(vertices))) for i in range(edges // queryEvery)]
+    graph = SimpleGraph()
+    for vertexName in range(vertices):
+        graph.addVertex(vertexName)
+
+    def insertAndQuery():
+        for start in range(0, edges, queryEvery):
+            graph.fromEdgeList(edgeList[start:start + queryEvery])
+            graph.numberOfComponents
+            graph.sameComponent(*queries[start // queryEvery])
+
+    elapsed = timeIt(insertAndQuery, repeat=1)
+    recount = timeIt(lambda: traversalComponentCount(graph), repeat=1)
+    query = timeIt(lambda: [graph.sameComponent(u, v) for u, v in queries], repeat=3) / len(queries)
+    print("Live graph with {} vertices taking {} edge inserts:".format(vertices, edges))
+    print("{:<40}{:>14.0f}".format("inserts/s with a query every {}".format(queryEvery), edges / elapsed))
+    print("{:<40}{:>14.1f}".format("sameComponent (us)", query * 1e6))
+    print("{:<40}{:>14.1f}".format("traversal recount per query (us)", recount * 1e6))
+
+
+def buildGridGraph(side, seed=0):
+    # a directed grid with both directions between neighbours and weights of
+    # 1 to 10, so the Manhattan distance is an admissible A* heuristic
+    rng = random.Random(seed)
+    graph = SimpleGraph(directed=True)
+    for x in range(side):
+        for y in range(side):
+            for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+                if 0 <= x + dx < side and 0 <= y + dy < side:
+                    graph.addEdge(("{},{}".format(x, y), "{},{}".format(x + dx, y + dy), rng.randint(1, 10)))
+    return graph
+
+
+def manhattanDistance(vertexName, dstName):
+    (x, y), (u, v) = map(int, vertexName.split(',')), map(int, dstName.split(','))
+    return abs(x - u) + abs(y - v)
+
+
+def benchmarkShortestPaths(side=100, hotSources=10, queries=2000):
+    # routing-style traffic: every query starts from one of a few hot sources;
+    # the point to point and uncached searches are timed on a sample only
+    graph = buildGridGraph(side)
+    rng = random.Random(1)
+    names = graph.vertexList
+    sources = rng.sample(names, hotSources)
+    pairs = [(rng.choice(sources), rng.choice(names)) for i in range(queries)]
+    shortestPaths = ShortestPaths(graph)
+    uncached = ShortestPaths(graph, cacheSize=0)
+    print("Shortest paths on a {0}x{0} weighted grid from {1} hot sources (us/query):".format(side, hotSources))
+    searches = (
+        ("dijkstra tree, cached", shortestPaths.path, queries),
+        ("dijkstra tree, no cache", uncached.path, queries // 100),
+        ("bidirectionalDijkstra", shortestPaths.bidirectionalDijkstra, queries // 10),
+        ("aStar, Manhattan heuristic", lambda u, v: shortestPaths.aStar(u, v, manhattanDistance), queries // 10),
+    )
+    for name, search, sampleSize in searches:
+        elapsed = timeIt(lambda: [search(u, v) for u, v in pairs[:sampleSize]], repeat=1)
+        print("{:<32}{:>12.1f}".format(name, elapsed / sampleSize * 1e6))
+    print("cache: {}".format(shortestPaths.cacheInfo))
+
+
+def benchmarkMultiSourceBfs(vertices=5 * 10**4, edges=25 * 10**4, sources=32, workerCounts=(1, 2, 4)):
+    # near linear scaling needs as many idle cores as workers; the core count is printed alongside
+    graph = buildGraph(randomEdgeList(vertices, edges))
+    csrGraph = graph.toCSR()
+    sourceNames = random.Random(0).sample(graph.vertexList, sources)
+    serial = timeIt(lambda: [graph.bfs(srcName) for srcName in sourceNames], repeat=1)
+    print("BFS from {} sources over {} vertices and {} edges on {} cores (sources/s):".format(
+        sources, vertices, edges, os.cpu_count()))
+    print("{:<32}{:>12.1f}".format("SimpleGraph.bfs, one at a time", sources / serial))
+    for workers in workerCounts:
+        elapsed = timeIt(lambda: csrGraph.multiSourceBfs(sourceNames, workers), repeat=1)
+        print("{:<32}{:>12.1f}".format("multiSourceBfs, {} workers".format(workers), sources / elapsed))
+
+
+def benchmarkAnalytics(vertices=10**5, edges=10**6):
+    # the loop column is the pure Python fallback used when numpy and scipy are missing
+    graph = CSRGraph.fromEdgeList(randomEdgeList(vertices, edges))
+    modes = [("loops", False)]
+    if GraphAnalytics(graph)._vectorized:
+        modes.append(("vectorized", True))
+    print("Analytics on {} vertices and {} edges (seconds):".format(vertices, edges))
+    print("{:<24}".format("measure") + "".join("{:>14}".format(name) for name, vectorized in modes))
+    measures = (
+        ("pageRank", lambda analytics: analytics.pageRank()),
+        ("degreeHistogram", lambda analytics: analytics.degreeHistogram),
+        ("triangles", lambda analytics: analytics.triangles),
+        ("clusteringCoefficients", lambda analytics: analytics.clusteringCoefficients),
+    )
+    for measureName, measure in measures:
+        # a fresh object per run so nothing comes from the cache, the export included
+        print("{:<24}".format(measureName) + "".join(
+            "{:>14.3f}".format(timeIt(lambda: measure(GraphAnalytics(graph, vectorized)), repeat=1))
+            for name, vectorized in modes))
+    analytics = GraphAnalytics(graph)
+    analytics.triangles
+    print("{:<24}{:>14.6f}".format("cached triangles", timeIt(lambda: analytics.triangles)))
+
+
+def benchmarkBatchUpdates(vertices=10**5, edges=5 * 10**5):
+    # the edge list repeats every edge once, which addEdges drops up front
+    edgeList = randomEdgeList(vertices, edges // 2) * 2
+
+    def addOneByOne():
+        graph = SimpleGraph()
+        for edge in edgeList:
+            graph.addEdge(edge)
+        return graph
+
+    def addInBulk():
+        graph = SimpleGraph()
+        graph.addEdges(edgeList)
+        return graph
+
+    graph = addInBulk()
+    removals = edgeList[:edges // 4]
+    print("Edge updates on {} vertices with {} edges given (edges/s):".format(vertices, edges))
+    print("{:<32}{:>14.0f}".format("addEdge, one at a time", edges / timeIt(addOneByOne, repeat=1)))
+    print("{:<32}{:>14.0f}".format("addEdges", edges / timeIt(addInBulk, repeat=1)))
+    print("{:<32}{:>14.0f}".format("removeEdges", len(removals) / timeIt(lambda: graph.removeEdges(removals), repeat=1)))
+    print("{:<32}{:>14.4f}".format("components rebuild (s)", timeIt(lambda: graph.numberOfComponents, repeat=1)))
+
+
+def benchmarkDirectedAlgorithms(sizes=(10**4, 10**5, 2 * 10**5), degree=5):
+    # random DAGs (every edge points to a larger id) plus a deep chain, which
+    # a recursive search could not walk; time per edge should stay flat
+    print("Directed algorithms on random DAGs with {} edges per vertex (ns per edge):".format(degree))
+    print("{:>10}{:>16}{:>14}{:>12}".format("vertices", "topologicalSort", "strongly cc", "findCycle"))
+    for n in sizes:
+        rng = random.Random(n)
+        edgeList = [(u, rng.randrange(u + 1, n), 1) for u in (rng.randrange(n - 1) for i in range(degree * n))]
+        graph = SimpleGraph(directed=True)
+        graph.addEdges(edgeList)
+        edges = len(edgeList)
+        print("{:>10}{:>16.0f}{:>14.0f}{:>12.0f}".format(
+            n,
+            timeIt(graph.topologicalSort, repeat=1) / edges * 1e9,
+            timeIt(lambda: graph.stronglyConnectedComponents, repeat=1) / edges * 1e9,
+            timeIt(graph.findCycle, repeat=1) / edges * 1e9))
+    chain = SimpleGraph(directed=True)
+    chain.addEdges((i, i + 1, 1) for i in range(10**5))
+    chain.addEdge((10**5, 0, 1))
+    print("{:<40}{:>10.3f}".format("cycle through a 10^5 vertex chain (s)", timeIt(chain.findCycle, repeat=1)))
+
+
+def readlinesLoad(filename):
+    # the line by line loader SimpleGraph.fromFile used before streaming
+    graph = SimpleGraph()
+    with open(filename, 'r') as f:
+        for line in f.readlines():
+            u, v = line.strip('\r').strip('\n').split()
+            graph.addEdge((u, v))
+    return graph
+
+
+def writeEdgeFile(f, vertices, edges, seed=0):
+    rng = random.Random(seed)
+    for start in range(0, edges, 10**5):
+        f.write("".join("{} {}\n".format(rng.randrange(vertices), rng.randrange(vertices))
+                        for i in range(min(10**5, edges - start))))
+
+
+def benchmarkEdgeFile(vertices=10**5, edges=10**6, workers=4):
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+        writeEdgeFile(f, vertices, edges)
+    try:
+        # shards are sized so every worker gets a few of them
+        shardSize = os.path.getsize(f.name) // (4 * workers) + 1
+        print("Loading an edge file with {} edges (edges/s):".format(edges))
+        loaders = (
+            ("readlines + addEdge (old)", lambda: readlinesLoad(f.name)),
+            ("iterEdgeFile", lambda: sum(1 for edge in iterEdgeFile(f.name))),
+            ("iterEdgeFile, {} workers".format(workers),
+             lambda: sum(1 for edge in iterEdgeFile(f.name, workers, shardSize=shardSize))),
+            ("SimpleGraph.fromFile", lambda: SimpleGraph().fromFile(f.name)),
+            ("CSRGraph.fromFile", lambda: CSRGraph.fromFile(f.name)),
+        )
+        for name, load in loaders:
+            print("{:<32}{:>14.0f}".format(name, edges / timeIt(load, repeat=1)))
+    finally:
+        os.remove(f.name)
+
+
+def benchmarkBinaryFormat(vertices=10**5, edges=5 * 10**5):
+    directory = tempfile.mkdtemp()
+    textFile, binaryFile = os.path.join(directory, 'edges.txt'), os.path.join(directory, 'graph.bin')
+    try:
+        with open(textFile, 'w') as f:
+            writeEdgeFile(f, vertices, edges)
+        CSRGraph.fromFile(textFile).save(binaryFile)
+        loaded = CSRGraph.load(binaryFile)
+        print("Opening a graph with {} vertices and {} edges ({:.1f} MB on disk) (seconds):".format(
+            vertices, edges, os.path.getsize(binaryFile) / 2**20))
+        loaders = (
+            ("SimpleGraph.fromFile", lambda: SimpleGraph().fromFile(textFile)),
+            ("CSRGraph.fromFile", lambda: CSRGraph.fromFile(textFile)),
+            ("SimpleGraph.fromBinaryFile", lambda: SimpleGraph().fromBinaryFile(binaryFile)),
+            ("CSRGraph.load", lambda: CSRGraph.load(binaryFile)),
+            ("CSRGraph.load + neighbours", lambda: CSRGraph.load(binaryFile).neighbours('0')),
+            ("bfs on a loaded graph", lambda: loaded.bfs('0')),
+        )
+        for name, load in loaders:
+            print("{:<32}{:>12.5f}".format(name, timeIt(load, repeat=1)))
+        del loaded
+    finally:
+        for filename in (textFile, binaryFile):
+            if os.path.exists(filename):
+                os.remove(filename)
+        os.rmdir(directory)
+
+
+def benchmarkInstrumentation(n=10**5):
+    keys = list(range(n))
+    linkedList = buildList(SinglyLinkedList, keys)
+    graph = buildGraph(randomEdgeList(n // 5, n))
+    workloads = (('makeList', lambda: buildList(SinglyLinkedList, keys)),
+                 ('getIndex', lambda: linkedList.getIndex(-1)),
+                 ('SimpleGraph.bfs', lambda: graph.bfs('0')))
+    print("Instrumentation overhead over {} keys (seconds):".format(n))
+    print("{:<20}{:>12}{:>12}{:>12}".format("operation", "never on", "enabled", "after off"))
+    for name, workload in workloads:
+        before = timeIt(workload)
+        with Instrumentation():
+            enabled = timeIt(workload)
+        print("{:<20}{:>12.4f}{:>12.4f}{:>12.4f}".format(name, before, enabled, timeIt(workload)))
+
+
+class OrderedDictLRU:
+    # the usual LRU cache on collections.OrderedDict, as a baseline
+    def __init__(self, capacity):
+        self._capacity = capacity
+        self._items = OrderedDict()
+
+    def get(self, key, default=None):
+        if key not in self._items:
+            return default
+        self._items.move_to_end(key)
+        return self._items[key]
+
+    def put(self, key, value):
+        self._items[key] = value
+        self._items.move_to_end(key)
+        if len(self._items) > self._capacity:
+            self._items.popitem(last=False)
+
+
+def cacheWorkload(cache, keys):
+    hits = 0
+    for key in keys:
+        if cache.get(key) is None:
+            cache.put(key, key)
+        else:
+            hits += 1
+    return hits
+
+
+def dequeWorkload(queue, operations, append, popLeft):
+    for i in range(operations):
+        append(queue, i)
+        if i % 2:
+            popLeft(queue)
+
+
+def benchmarkCaches(operations=2 * 10**5, capacity=1000, keySpace=10**4):
+    # a skewed key stream: a few keys are hot, most are rarely repeated
+    rng = random.Random(0)
+    keys = [int(keySpace ** rng.random()) for i in range(operations)]
+    print("Read-through caching of {} skewed keys with capacity {}:".format(operations, capacity))
+    print("{:<20}{:>10}{:>10}{:>16}".format("cache", "seconds", "hit rate", "ns per access"))
+    for name, makeCache in (('OrderedDict LRU', lambda: OrderedDictLRU(capacity)),
+                            ('LRUCache', lambda: LRUCache(capacity)),
+                            ('LFUCache', lambda: LFUCache(capacity)),
+                            ('TTLCache', lambda: TTLCache(capacity, ttl=3600))):
+        hits = cacheWorkload(makeCache(), keys)
+        seconds = timeIt(lambda: cacheWorkload(makeCache(), keys))
+        print("{:<20}{:>10.4f}{:>10.3f}{:>16.0f}".format(name, seconds, hits / operations, seconds / operations * 1e9))
+    print("{:<20}{:>10}".format("queue", "seconds"))
+    for name, makeQueue, append, popLeft in (
+            ('collections.deque', deque, deque.append, deque.popleft),
+            ('Deque', Deque, Deque.insertAtEnd, Deque.popAtBeginning),
+            ('DoublyLinkedList', DoublyLinkedList, DoublyLinkedList.insertAtEnd, DoublyLinkedList.deleteAtBeginning)):
+        print("{:<20}{:>10.4f}".format(name, timeIt(lambda: dequeWorkload(makeQueue(), operations, append, popLeft))))
+
+
+def report():
+    benchmarkMakeList()
+    benchmarkMemory()
+    benchmarkMergeSort()
+    benchmarkPositionalEdits()
+    benchmarkScans()
+    benchmarkCopyAndReverse()
+    benchmarkSnapshots()
+    benchmarkRotations()
+    benchmarkConcurrentQueue()
+    benchmarkCaches()
+    benchmarkGraphLayouts()
+    benchmarkTraversals()
+    benchmarkIncrementalComponents()
+    benchmarkBatchUpdates()
+    benchmarkDirectedAlgorithms()
+    benchmarkShortestPaths()
+    benchmarkMultiSourceBfs()
+    benchmarkAnalytics()
+    benchmarkEdgeFile()
+    benchmarkBinaryFormat()
+    benchmarkInstrumentation()
+
+
+# An operation for the size sweeps: setup(n) builds the input outside the
+# timing and run(state) is the timed part. Operations that change their input
+# get a fresh setup for every repeat.
+Operation = namedtuple('Operation', 'setup run mutates')
+
+# operations that would be quadratic on some lists do a fixed number of steps
+# instead of n, so the sweep stays fast and the exponent shows the cost per step
+fixedSteps = 100
+
+
+def shuffledKeys(n):
+    keys = list(range(n))
+    random.Random(n).shuffle(keys)
+    return keys
+
+
+def repeatSteps(method, argument):
+    for i in range(fixedSteps):
+        method(argument)
+
+
+def linkedListOperations(listClass):
+    name = listClass.__name__
+    build = lambda n: buildList(listClass, shuffledKeys(n))
+    buildSorted = lambda n: buildList(listClass, range(n))
+    operations = {
+        'insertAtBeginning': Operation(lambda n: (listClass(), shuffledKeys(n)),
+                                       lambda state: [state[0].insertAtBeginning(key) for key in state[1]], True),
+        'insertAtEnd': Operation(lambda n: (listClass(), shuffledKeys(n)),
+                                 lambda state: [state[0].insertAtEnd(key) for key in state[1]], True),
+        'makeList': Operation(lambda n: (listClass(), shuffledKeys(n)),
+                              lambda state: state[0].makeList(state[1]), True),
+        'deleteAtBeginning': Operation(build, lambda linkedList: [linkedList.deleteAtBeginning()
+                                                                  for i in range(len(linkedList))], True),
+        'deleteAtEnd x{}'.format(fixedSteps): Operation(
+            build, lambda linkedList: [linkedList.deleteAtEnd() for i in range(fixedSteps)], True),
+        'insertAtIndex x{}'.format(fixedSteps): Operation(
+            build, lambda linkedList: [linkedList.insertAtIndex(-1, len(linkedList) // 2)
+                                       for i in range(fixedSteps)], True),
+        'updateAtIndex x{}'.format(fixedSteps): Operation(
+            build, lambda linkedList: [linkedList.updateAtIndex(len(linkedList) // 2, -1)
+                                       for i in range(fixedSteps)], False),
+        'getIndex x{}'.format(fixedSteps): Operation(
+            buildSorted, lambda linkedList: repeatSteps(linkedList.getIndex, len(linkedList) - 1), False),
+        'deleteKey x{}'.format(fixedSteps): Operation(
+            buildSorted, lambda linkedList: [linkedList.deleteKey(len(linkedList) - 1)
+                                             for i in range(fixedSteps)], True),
+        'sortedInsertion x{}'.format(fixedSteps): Operation(
+            buildSorted, lambda linkedList: repeatSteps(linkedList.sortedInsertion, len(linkedList) // 2), True),
+        'count': Operation(build, lambda linkedList: linkedList.count(0), False),
+        'copy': Operation(build, lambda linkedList: linkedList.copy(), False),
+        'reverse': Operation(build, lambda linkedList: linkedList.reverse(), False),
+        'getDuplicateList': Operation(build, lambda linkedList: linkedList.getDuplicateList(), False),
+        'getReverseList': Operation(build, lambda linkedList: linkedList.getReverseList(), False),
+        'getMiddleNode': Operation(build, lambda linkedList: linkedList.getMiddleNode(), False),
+        'isSorted': Operation(buildSorted, lambda linkedList: linkedList.isSorted(), False),
+        'mergeSort': Operation(build, lambda linkedList: linkedList.mergeSort(), True),
+        'rotate': Operation(build, lambda linkedList: linkedList.rotate(len(linkedList) // 3), False),
+        'deleteWhere': Operation(build, lambda linkedList: linkedList.deleteWhere(lambda key: key % 2), True),
+        'iterate': Operation(build, lambda linkedList: sum(linkedList), False),
+    }
+    return {'{}.{}'.format(name, operationName): operation for operationName, operation in operations.items()}
+
+
+def graphInput(n, directed=False, acyclic=False):
+    # n edges over n // 4 vertices; acyclic edges always point to a larger id
+    vertices = max(n // 4, 2)
+    rng = random.Random(n)
+    edgeList = list()
+    for i in range(n):
+        u, v = rng.randrange(vertices), rng.randrange(vertices)
+        if acyclic:
+            u, v = min(u, v), max(u, v) + (u == v)
+        edgeList.append((u, v, rng.randint(1, 10)) if directed else (u, v))
+    return edgeList
+
+
+def buildDirectedGraph(edgeList):
+    graph = SimpleGraph(directed=True)
+    graph.addEdges(edgeList)
+    return graph
+
+
+def removedEdgeGraph(n):
+    graph = buildGraph(graphInput(n))
+    graph.removeEdge(graphInput(n)[0])
+    return graph
+
+
+def graphOperations():
+    return {
+        'SimpleGraph.addEdge': Operation(lambda n: (SimpleGraph(), graphInput(n)),
+                                         lambda state: [state[0].addEdge(edge) for edge in state[1]], True),
+        'SimpleGraph.addEdges': Operation(graphInput, lambda edgeList: SimpleGraph().addEdges(edgeList), False),
+        'SimpleGraph.removeEdges': Operation(lambda n: (buildGraph(graphInput(n)), graphInput(n)[:n // 2]),
+                                             lambda state: state[0].removeEdges(state[1]), True),
+        'SimpleGraph.bfs': Operation(lambda n: buildGraph(graphInput(n)), lambda graph: graph.bfs('0'), False),
+        'SimpleGraph.dfs': Operation(lambda n: buildGraph(graphInput(n)), lambda graph: graph.dfs('0'), False),
+        'SimpleGraph.connectedComponents': Operation(lambda n: buildGraph(graphInput(n)),
+                                                     lambda graph: graph.connectedComponents, False),
+        'SimpleGraph.numberOfComponents after removal': Operation(
+            removedEdgeGraph, lambda graph: graph.numberOfComponents, True),
+        'SimpleGraph.toCSR': Operation(lambda n: buildGraph(graphInput(n)), lambda graph: graph.toCSR(), False),
+        'SimpleGraph.topologicalSort': Operation(lambda n: buildDirectedGraph(graphInput(n, True, True)),
+                                                 lambda graph: graph.topologicalSort(), False),
+        'SimpleGraph.findCycle': Operation(lambda n: buildDirectedGraph(graphInput(n, True, True)),
+                                           lambda graph: graph.findCycle(), False),
+        'SimpleGraph.stronglyConnectedComponents': Operation(lambda n: buildDirectedGraph(graphInput(n, True)),
+                                                             lambda graph: graph.stronglyConnectedComponents, False),
+        'CSRGraph.fromEdgeList': Operation(graphInput, CSRGraph.fromEdgeList, False),
+        'CSRGraph.bfs': Operation(lambda n: CSRGraph.fromEdgeList(graphInput(n)), lambda graph: graph.bfs('0'), False),
+        'CSRGraph.connectedComponents': Operation(lambda n: CSRGraph.fromEdgeList(graphInput(n)),
+                                                  lambda graph: graph.connectedComponents, False),
+        'ShortestPaths.dijkstra': Operation(lambda n: buildDirectedGraph(graphInput(n, True)),
+                                            lambda graph: ShortestPaths(graph).dijkstra('0'), False),
+        'GraphAnalytics.pageRank': Operation(lambda n: CSRGraph.fromEdgeList(graphInput(n)),
+                                             lambda graph: GraphAnalytics(graph, vectorized=False).pageRank(), False),
+        'GraphAnalytics.triangles': Operation(lambda n: CSRGraph.fromEdgeList(graphInput(n)),
+                                              lambda graph: GraphAnalytics(graph, vectorized=False).triangles, False),
+    }
+
+
+def sweepOperations():
+    operations = dict()
+    for listClass in (SinglyLinkedList, DoublyLinkedList):
+        operations.update(linkedListOperations(listClass))
+    operations.update({
+        'IndexedDoublyLinkedList.getIndex x{}'.format(fixedSteps): Operation(
+            lambda n: buildList(IndexedDoublyLinkedList, range(n)),
+            lambda linkedList: repeatSteps(linkedList.getIndex, len(linkedList) - 1), False),
+        'IndexableSkipList.insertAtIndex x{}'.format(fixedSteps): Operation(
+            lambda n: buildList(IndexableSkipList, range(n)),
+            lambda linkedList: [linkedList.insertAtIndex(-1, len(linkedList) // 2) for i in range(fixedSteps)], True),
+        'PersistentList.insertAtBeginning': Operation(shuffledKeys, prependAll, False),
+        'PersistentList.updateAtIndex x{}'.format(fixedSteps): Operation(
+            lambda n: prependAll(range(n)),
+            lambda persistentList: [persistentList.updateAtIndex(len(persistentList) // 2, -1)
+                                    for i in range(fixedSteps)], False),
+        'Deque.insertAtEnd': Operation(lambda n: (Deque(), shuffledKeys(n)),
+                                       lambda state: [state[0].insertAtEnd(key) for key in state[1]], True),
+        'Deque.popAtBeginning': Operation(lambda n: buildList(Deque, range(n)),
+                                          lambda queue: [queue.popAtBeginning() for i in range(len(queue))], True),
+        'LRUCache.get and put': Operation(lambda n: (LRUCache(max(n // 10, 1)), shuffledKeys(n) * 2),
+                                          lambda state: cacheWorkload(*state), True),
+        'LFUCache.get and put': Operation(lambda n: (LFUCache(max(n // 10, 1)), shuffledKeys(n) * 2),
+                                          lambda state: cacheWorkload(*state), True),
+        'UnrolledLinkedList.makeList': Operation(lambda n: (UnrolledLinkedList(), shuffledKeys(n)),
+                                                 lambda state: state[0].makeList(state[1]), True),
+        'UnrolledLinkedList.getIndex x{}'.format(fixedSteps): Operation(
+            lambda n: buildList(UnrolledLinkedList, range(n)),
+            lambda linkedList: repeatSteps(linkedList.getIndex, len(linkedList) - 1), False),
+        'PooledLinkedList.insertAtEnd': Operation(lambda n: (PooledLinkedList(), shuffledKeys(n)),
+                                                  lambda state: [state[0].insertAtEnd(key) for key in state[1]], True),
+        'ConcurrentDoublyLinkedList.insertAtEnd': Operation(
+            lambda n: (ConcurrentDoublyLinkedList(), shuffledKeys(n)),
+            lambda state: [state[0].insertAtEnd(key) for key in state[1]], True),
+    })
+    operations.update(graphOperations())
+    return operations
+
+
+def logSizes(minSize, maxSize, points):
+    if points < 2 or maxSize <= minSize:
+        return [minSize]
+    ratio = maxSize / minSize
+    return sorted({int(round(minSize * ratio ** (i / (points - 1)))) for i in range(points)})
+
+
+def fitExponent(sizes, values):
+    # least squares of log(value) on log(size): value is about coefficient * size ** exponent
+    points = [(math.log(size), math.log(value)) for size, value in zip(sizes, values) if value > 0]
+    if len(points) < 2:
+        return None, None
+    meanX = sum(x for x, y in points) / len(points)
+    meanY = sum(y for x, y in points) / len(points)
+    spread = sum((x - meanX) ** 2 for x, y in points)
+    if spread == 0:
+        return None, None
+    exponent = sum((x - meanX) * (y - meanY) for x, y in points) / spread
+    return exponent, math.exp(meanY - exponent * meanX)
+
+
+def measureOperation(operation, n, repeat, memory):
+    best = float('inf')
+    state = None
+    for i in range(repeat):
+        if state is None or operation.mutates:
+            state = operation.setup(n)
+        start = time.perf_counter()
+        operation.run(state)
+        best = min(best, time.perf_counter() - start)
+    peak = None
+    if memory:
+        # a separate untimed run, since tracing slows everything down;
+        # the setup happens before tracing starts so only the run is counted
+        state = operation.setup(n)
+        tracemalloc.start()
+        operation.run(state)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return best, peak
+
+
+def runSweep(operations, sizes, repeat=3, memory=True, progress=None):
+    results = dict()
+    for name, operation in operations.items():
+        seconds, peaks = list(), list()
+        for n in sizes:
+            elapsed, peak = measureOperation(operation, n, repeat, memory)
+            seconds.append(elapsed)
+            peaks.append(peak)
+        exponent, coefficient = fitExponent(sizes, seconds)
+        results[name] = {'sizes': list(sizes), 'seconds': seconds, 'peakBytes': peaks,
+                         'exponent': exponent, 'coefficient': coefficient}
+        if progress is not None:
+            progress(name, results[name])
+    return results
+
+
+def printSweepResult(name, result):
+    exponent = "-" if result['exponent'] is None else "{:.2f}".format(result['exponent'])
+    peak = result['peakBytes'][-1]
+    print("{:<52}{:>10}{:>16.6f}{:>14}".format(
+        name, exponent, result['seconds'][-1], "-" if peak is None else "{:.0f}".format(peak)))
+
+
+def compareResults(baseline, current, exponentTolerance=0.2, factorTolerance=1.5):
+    # an operation regresses when its fitted exponent grew by more than
+    # exponentTolerance, or when its time or peak memory at the largest
+    # size both runs share grew by more than factorTolerance times
+    regressions = dict()
+    print("{:<52}{:>10}{:>10}{:>10}{:>10}  {}".format(
+        "operation", "exp base", "exp now", "time x", "memory x", "flags"))
+    for name, base in sorted(baseline.items()):
+        now = current.get(name)
+        if now is None:
+            print("{:<52}  missing from the current results".format(name))
+            continue
+        flags = list()
+        if (base['exponent'] is not None and now['exponent'] is not None and
+                now['exponent'] - base['exponent'] > exponentTolerance):
+            flags.append('scaling')
+        commonSizes = set(base['sizes']) & set(now['sizes'])
+        timeRatio = memoryRatio = None
+        if commonSizes:
+            size = max(commonSizes)
+            baseAt, nowAt = base['sizes'].index(size), now['sizes'].index(size)
+            timeRatio = now['seconds'][nowAt] / base['seconds'][baseAt] if base['seconds'][baseAt] else None
+            if timeRatio is not None and timeRatio > factorTolerance:
+                flags.append('slower')
+            basePeak, nowPeak = base['peakBytes'][baseAt], now['peakBytes'][nowAt]
+            if basePeak and nowPeak is not None:
+                memoryRatio = nowPeak / basePeak
+                if memoryRatio > factorTolerance:
+                    flags.append('memory')
+        if flags:
+            regressions[name] = flags
+        print("{:<52}{:>10}{:>10}{:>10}{:>10}  {}".format(
+            name, *("-" if value is None else "{:.2f}".format(value)
+                    for value in (base['exponent'], now['exponent'], timeRatio, memoryRatio)),
+            ", ".join(flags)))
+    return regressions
+
+
+def selectOperations(patterns):
+    operations = sweepOperations()
+    return {name: operation for name, operation in operations.items()
+            if any(fnmatch(name, pattern) for pattern in patterns)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks for the linked lists and graphs.")
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.add_parser('report', help="print the comparison tables (the default)")
+    runParser = subparsers.add_parser('run', help="sweep input sizes and fit complexity exponents")
+    compareParser = subparsers.add_parser('compare', help="flag regressions against a stored baseline")
+    for subparser in (runParser, compareParser):
+        subparser.add_argument('--operations', nargs='+', default=['*'], metavar='PATTERN',
+                               help="glob patterns over operation names such as 'SinglyLinkedList.*'")
+        subparser.add_argument('--repeat', type=int, default=3, help="best of this many timed runs")
+        subparser.add_argument('--no-memory', action='store_true', help="skip the tracemalloc peak runs")
+        subparser.add_argument('--output', help="write the results as JSON to this file")
+    runParser.add_argument('--min-size', type=int, default=10**3)
+    runParser.add_argument('--max-size', type=int, default=10**5)
+    runParser.add_argument('--points', type=int, default=5, help="sizes on a log scale between the bounds")
+    runParser.add_argument('--list', action='store_true', help="list the operation names and exit")
+    compareParser.add_argument('baseline', help="JSON results of an earlier run")
+    compareParser.add_argument('current', nargs='?',
+                               help="JSON results to check; without it the baseline's operations are run again")
+    compareParser.add_argument('--exponent-tolerance', type=float, default=0.2)
+    compareParser.add_argument('--factor-tolerance', type=float, default=1.5)
+    args = parser.parse_args(argv)
+
+    if args.command is None or args.command == 'report':
+        report()
+        return 0
+    if args.command == 'run' and args.list:
+        print(*selectOperations(args.operations), sep='\n')
+        return 0
+    if args.command == 'compare':
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        baseline['operations'] = {name: result for name, result in baseline['operations'].items()
+                                  if any(fnmatch(name, pattern) for pattern in args.operations)}
+    if args.command == 'compare' and args.current:
+        with open(args.current) as f:
+            current = json.load(f)
+    else:
+        if args.command == 'run':
+            sizes = logSizes(args.min_size, args.max_size, args.points)
+            operations = selectOperations(args.operations)
+        else:
+            sizes = baseline['sizes']
+            operations = {name: operation for name, operation in selectOperations(args.operations).items()
+                          if name in baseline['operations']}
+        print("{:<52}{:>10}{:>16}{:>14}".format("operation", "exponent", "seconds at max", "peak bytes"))
+        current = {
+            'meta': {'python': platform.python_version(), 'platform': platform.platform(),
+                     'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'repeat': args.repeat},
+            'sizes': sizes,
+            'operations': runSweep(operations, sizes, args.repeat, not args.no_memory, printSweepResult),
+        }
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(current, f, indent=2)
+    if args.command == 'compare':
+        regressions = compareResults(baseline['operations'], current['operations'],
+                                     args.exponent_tolerance, args.factor_tolerance)
+        print("{} of {} operations regressed".format(len(regressions), len(baseline['operations'])))
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+import time
+
+from LinkedList import Deque, DoublyNode
+
+
+class CacheEntry(DoublyNode):
+    __slots__ = ('value', 'weight')
+
+    def __init__(self, key=None, nextNode=None, previousNode=None):
+        super().__init__(key, nextNode, previousNode)
+        self.value = None
+        self.weight = 1
+
+
+class ExpiringEntry(CacheEntry):
+    __slots__ = ('expiresAt', 'expiryNode')
+
+
+class FrequencyEntry(CacheEntry):
+    __slots__ = ('bucket',)
+
+
+class FrequencyBucket(DoublyNode):
+    # the key is the access count shared by every entry in the bucket
+    __slots__ = ('entries',)
+
+    def __init__(self, key=None, nextNode=None, previousNode=None):
+        super().__init__(key, nextNode, previousNode)
+        self.entries = Deque(FrequencyEntry)
+
+
+class LRUCache:
+    # a dictionary from each key to its entry node in a Deque kept in recency
+    # order, so get, put, move-to-front and evict are all O(1). The capacity
+    # bounds the total weight, which is the number of items unless a
+    # weigher(key, value) is given. onEvict(key, value) is called for every
+    # item that leaves for lack of room (or, in TTLCache, because it expired),
+    # but not for deletes or overwrites. Subclasses change the policy through
+    # _link, _touch, _unlink and _victim.
+    entryClass = CacheEntry
+
+    def __init__(self, capacity=128, weigher=None, onEvict=None):
+        if capacity <= 0:
+            raise ValueError("The capacity must be positive")
+        self._capacity = capacity
+        self._weigher = weigher
+        self._onEvict = onEvict
+        self._entries = dict()
+        self._order = Deque(self.entryClass)
+        self._weight = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    @property
+    def cacheInfo(self):
+        return {'hits': self._hits, 'misses': self._misses, 'evictions': self._evictions,
+                'expirations': self._expirations, 'size': len(self), 'weight': self._weight,
+                'capacity': self._capacity}
+
+    def clear(self):
+        for entry in list(self._entries.values()):
+            self._remove(entry)
+
+    def delete(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            raise KeyError(key)
+        self._remove(entry)
+        return entry.value
+
+    def get(self, key, default=None):
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return default
+        self._hits += 1
+        self._touch(entry)
+        return entry.value
+
+    def peek(self, key, default=None):
+        # reads the value without counting an access
+        entry = self._entries.get(key)
+        return default if entry is None else entry.value
+
+    def put(self, key, value):
+        weight = 1 if self._weigher is None else self._weigher(key, value)
+        if weight > self._capacity:
+            raise ValueError("An item of weight {} cannot fit a capacity of {}".format(weight, self._capacity))
+        # room is made before the item is linked, so it is never its own victim
+        entry = self._entries.get(key)
+        oldWeight = 0 if entry is None else entry.weight
+        while self._weight - oldWeight + weight > self._capacity:
+            victim = self._victim(entry)
+            self._remove(victim)
+            self._evictions += 1
+            if self._onEvict is not None:
+                self._onEvict(victim.key, victim.value)
+        if entry is None:
+            entry = self._entries[key] = self._link(key)
+        else:
+            self._touch(entry)
+        entry.value = value
+        self._weight += weight - oldWeight
+        entry.weight = weight
+
+    def _link(self, key):
+        return self._order.insertAtBeginning(key)
+
+    def _remove(self, entry):
+        del self._entries[entry.key]
+        self._unlink(entry)
+        self._weight -= entry.weight
+
+    def _touch(self, entry):
+        self._order.moveToBeginning(entry)
+
+    def _unlink(self, entry):
+        self._order.removeNode(entry)
+
+    def _victim(self, keptEntry):
+        # the entry to evict next, other than keptEntry, the one being put
+        victim = self._order.lastNode
+        return victim.prev if victim is keptEntry else victim
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class LFUCache(LRUCache):
+    # evicts the least frequently used item, and the least recently used one
+    # among equals. Entries sit in buckets of equal access count, and the
+    # buckets in a Deque of increasing count, so an access moves an entry to
+    # the next bucket and the victim is at the end of the first one, all O(1).
+    entryClass = FrequencyEntry
+
+    def __init__(self, capacity=128, weigher=None, onEvict=None):
+        super().__init__(capacity, weigher, onEvict)
+        self._buckets = Deque(FrequencyBucket)
+
+    def _link(self, key):
+        bucket = self._buckets.firstNode
+        if bucket is None or bucket.key != 1:
+            bucket = self._buckets.insertAtBeginning(1)
+        entry = bucket.entries.insertAtBeginning(key)
+        entry.bucket = bucket
+        return entry
+
+    def _touch(self, entry):
+        bucket = entry.bucket
+        if bucket is self._buckets.lastNode or bucket.next.key != bucket.key + 1:
+            nextBucket = self._buckets.insertAfter(bucket, bucket.key + 1)
+        else:
+            nextBucket = bucket.next
+        self._unlink(entry)
+        nextBucket.entries.linkAtBeginning(entry)
+        entry.bucket = nextBucket
+
+    def _unlink(self, entry):
+        bucket = entry.bucket
+        bucket.entries.removeNode(entry)
+        if bucket.entries.isEmpty():
+            self._buckets.removeNode(bucket)
+
+    def _victim(self, keptEntry):
+        bucket = self._buckets.firstNode
+        victim = bucket.entries.lastNode
+        if victim is not keptEntry:
+            return victim
+        return victim.prev if len(bucket.entries) > 1 else bucket.next.entries.lastNode
+
+
+class TTLCache(LRUCache):
+    # an LRU cache whose items also expire ttl seconds after they were last
+    # put. With one ttl for every item, a second Deque in put order is also in
+    # expiry order, so expired items are dropped from its front in O(1) each.
+    entryClass = ExpiringEntry
+
+    def __init__(self, capacity=128, ttl=60.0, weigher=None, onEvict=None, timer=time.monotonic):
+        super().__init__(capacity, weigher, onEvict)
+        self._ttl = ttl
+        self._timer = timer
+        self._expiry = Deque()
+
+    @property
+    def cacheInfo(self):
+        self._removeExpired()
+        return super().cacheInfo
+
+    def get(self, key, default=None):
+        self._removeExpired()
+        return super().get(key, default)
+
+    def peek(self, key, default=None):
+        self._removeExpired()
+        return super().peek(key, default)
+
+    def put(self, key, value):
+        now = self._timer()
+        self._removeExpired(now)
+        super().put(key, value)
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.expiresAt = now + self._ttl
+            self._expiry.moveToEnd(entry.expiryNode)
+
+    def _link(self, key):
+        entry = super()._link(key)
+        entry.expiresAt = self._timer() + self._ttl
+        entry.expiryNode = self._expiry.insertAtEnd(entry)
+        return entry
+
+    def _removeExpired(self, now=None):
+        if now is None:
+            now = self._timer()
+        node = self._expiry.firstNode
+        while node is not None and node.key.expiresAt <= now:
+            entry = node.key
+            self._remove(entry)
+            self._expirations += 1
+            if self._onEvict is not None:
+                self._onEvict(entry.key, entry.value)
+            node = self._expiry.firstNode
+
+    def _unlink(self, entry):
+        super()._unlink(entry)
+        self._expiry.removeNode(entry.expiryNode)
+
+    def __contains__(self, key):
+        self._removeExpired()
+        return super().__contains__(key)
+
+    def __len__(self):
+        self._removeExpired()
+        return super().__len__()
+
+
+def main():
+    evicted = list()
+    lru = LRUCache(capacity=3, onEvict=lambda key, value: evicted.append(key))
+    for key in 'ABCAD':
+        if lru.get(key) is None:
+            lru.put(key, key.lower())
+    print("LRU evicted:", evicted, lru.cacheInfo)
+
+    evicted.clear()
+    lfu = LFUCache(capacity=3, onEvict=lambda key, value: evicted.append(key))
+    for key in 'AABBCAD':
+        if lfu.get(key) is None:
+            lfu.put(key, key.lower())
+    print("LFU evicted:", evicted, lfu.cacheInfo)
+
+    # a new key stays even when every older key has been used more often
+    evicted.clear()
+    lfu = LFUCache(capacity=2, onEvict=lambda key, value: evicted.append(key))
+    for key in 'AB':
+        lfu.put(key, key.lower())
+        lfu.get(key)
+    lfu.put('C', 'c')
+    print("LFU evicted:", evicted, "and keeps 'C':", 'C' in lfu)
+
+    now = [0.0]
+    ttl = TTLCache(capacity=10, ttl=5, timer=lambda: now[0])
+    ttl.put('A', 1)
+    now[0] = 3
+    ttl.put('B', 2)
+    now[0] = 6
+    print("After 6 seconds 'A' is", ttl.get('A'), "and 'B' is", ttl.get('B'), ttl.cacheInfo)
+
+    sized = LRUCache(capacity=10, weigher=lambda key, value: len(value))
+    for key, value in (('a', 'xxxx'), ('b', 'xxxxx'), ('c', 'xxx')):
+        sized.put(key, value)
+    print("Weighted cache keeps", [key for key in 'abc' if key in sized], sized.cacheInfo)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+from SimpleGraph import CSRGraph, SimpleGraph
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:
+    np = sparse = None
+
+
+class GraphAnalytics:
+    # whole-graph measures over a SimpleGraph or CSRGraph. With NumPy and SciPy
+    # installed the graph is exported once to a sparse adjacency matrix and
+    # every measure is a vectorised operation on it; without them, or with
+    # vectorized=False, plain loops over the CSR arrays compute the same
+    # results. Everything is cached until the graph's version changes.
+    def __init__(self, graph, vectorized=None):
+        if vectorized is None:
+            vectorized = sparse is not None
+        elif vectorized and sparse is None:
+            raise ImportError("Vectorized analytics need numpy and scipy")
+        self._graph = graph
+        self._vectorized = vectorized
+        self._cache = dict()
+        self._cacheVersion = graph.version
+
+    @property
+    def adjacencyMatrix(self):
+        # a scipy.sparse CSR matrix with a 1 for every stored edge; its index
+        # arrays are read straight from the CSR arrays of the graph
+        if sparse is None:
+            raise ImportError("The adjacency matrix needs numpy and scipy")
+        return self._cached('adjacencyMatrix', self._buildAdjacencyMatrix)
+
+    @property
+    def clusteringCoefficients(self):
+        # local clustering of every vertex, ignoring edge direction and self-loops
+        return self._cached('clusteringCoefficients', self._computeClusteringCoefficients)
+
+    @property
+    def degreeHistogram(self):
+        # {degree: number of vertices}, using the out-degree for directed graphs
+        return self._cached('degreeHistogram', self._computeDegreeHistogram)
+
+    def pageRank(self, damping=0.85, tolerance=1e-8, maxIterations=100):
+        # power iteration until the L1 change drops below tolerance; dangling
+        # vertices spread their rank evenly over the whole graph
+        return self._cached(('pageRank', damping, tolerance, maxIterations),
+                            lambda: self._computePageRank(damping, tolerance, maxIterations))
+
+    @property
+    def triangles(self):
+        # the number of triangles through every vertex, ignoring edge direction and self-loops
+        return self._cached('triangles', self._computeTriangles)
+
+    def _buildAdjacencyMatrix(self):
+        csrGraph = self._csrGraph()
+        vertexCount = csrGraph.numberOfVertices
+        indptr = np.frombuffer(csrGraph._offsets, dtype=np.int64)
+        indices = np.frombuffer(csrGraph._neighbours, dtype=np.int32)
+        return sparse.csr_matrix((np.ones(len(indices)), indices, indptr), shape=(vertexCount, vertexCount))
+
+    def _cached(self, key, compute):
+        if self._cacheVersion != self._graph.version:
+            self._cache.clear()
+            self._cacheVersion = self._graph.version
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def _computeClusteringCoefficients(self):
+        triangles = self.triangles
+        if self._vectorized:
+            degrees = np.diff(self._undirectedMatrix().indptr).tolist()
+        else:
+            degrees = [len(neighbourSet) for neighbourSet in self._undirectedNeighbourSets()]
+        return {vertexName: 2 * triangles[vertexName] / (degree * (degree - 1)) if degree > 1 else 0.0
+                for vertexName, degree in zip(self._csrGraph()._names, degrees)}
+
+    def _computeDegreeHistogram(self):
+        offsets = self._csrGraph()._offsets
+        if self._vectorized:
+            counts = np.bincount(np.diff(np.frombuffer(offsets, dtype=np.int64)))
+            return {degree: count for degree, count in enumerate(counts.tolist()) if count}
+        histogram = dict()
+        for vertexId in range(len(offsets) - 1):
+            degree = offsets[vertexId + 1] - offsets[vertexId]
+            histogram[degree] = histogram.get(degree, 0) + 1
+        return dict(sorted(histogram.items()))
+
+    def _computePageRank(self, damping, tolerance, maxIterations):
+        csrGraph = self._csrGraph()
+        vertexCount = csrGraph.numberOfVertices
+        if vertexCount == 0:
+            return dict()
+        if self._vectorized:
+            rank = self._vectorizedPageRank(damping, tolerance, maxIterations)
+        else:
+            rank = self._loopPageRank(damping, tolerance, maxIterations)
+        return dict(zip(csrGraph._names, rank))
+
+    def _computeTriangles(self):
+        names = self._csrGraph()._names
+        if self._vectorized:
+            undirected = self._undirectedMatrix()
+            # (S @ S)[u, v] counts the paths u - w - v; keeping only the pairs
+            # that are edges counts each triangle through u twice
+            paths = (undirected @ undirected).multiply(undirected)
+            counts = np.asarray(paths.sum(axis=1)).ravel() // 2
+            return dict(zip(names, counts.astype(np.int64).tolist()))
+        neighbourSets = self._undirectedNeighbourSets()
+        counts = [0] * len(neighbourSets)
+        # each triangle u < v < w is found once, from its smallest vertex
+        for u, uNeighbours in enumerate(neighbourSets):
+            for v in uNeighbours:
+                if v > u:
+                    for w in uNeighbours & neighbourSets[v]:
+                        if w > v:
+                            counts[u] += 1
+                            counts[v] += 1
+                            counts[w] += 1
+        return dict(zip(names, counts))
+
+    def _csrGraph(self):
+        if isinstance(self._graph, CSRGraph):
+            return self._graph
+        return self._cached('csrGraph', self._graph.toCSR)
+
+    def _loopPageRank(self, damping, tolerance, maxIterations):
+        csrGraph = self._csrGraph()
+        offsets, neighbours = csrGraph._offsets, csrGraph._neighbours
+        vertexCount = csrGraph.numberOfVertices
+        rank = [1.0 / vertexCount] * vertexCount
+        for iteration in range(maxIterations):
+            newRank = [0.0] * vertexCount
+            danglingRank = 0.0
+            for vertexId in range(vertexCount):
+                start, end = offsets[vertexId], offsets[vertexId + 1]
+                if start == end:
+                    danglingRank += rank[vertexId]
+                    continue
+                share = rank[vertexId] / (end - start)
+                for neighbourId in neighbours[start:end]:
+                    newRank[neighbourId] += share
+            base = (damping * danglingRank + 1 - damping) / vertexCount
+            newRank = [damping * value + base for value in newRank]
+            change = sum(abs(new - old) for new, old in zip(newRank, rank))
+            rank = newRank
+            if change < tolerance:
+                break
+        return rank
+
+    def _undirectedMatrix(self):
+        def build():
+            adjacency = self.adjacencyMatrix
+            undirected = ((adjacency + adjacency.T) > 0).astype(np.float64)
+            undirected = (undirected - sparse.diags(undirected.diagonal())).tocsr()
+            undirected.eliminate_zeros()
+            return undirected
+        return self._cached('undirectedMatrix', build)
+
+    def _undirectedNeighbourSets(self):
+        def build():
+            csrGraph = self._csrGraph()
+            offsets, neighbours = csrGraph._offsets, csrGraph._neighbours
+            neighbourSets = [set() for vertexId in range(csrGraph.numberOfVertices)]
+            for u, uNeighbours in enumerate(neighbourSets):
+                for v in neighbours[offsets[u]:offsets[u + 1]]:
+                    if u != v:
+                        uNeighbours.add(v)
+                        neighbourSets[v].add(u)
+            return neighbourSets
+        return self._cached('undirectedNeighbourSets', build)
+
+    def _vectorizedPageRank(self, damping, tolerance, maxIterations):
+        adjacency = self.adjacencyMatrix
+        vertexCount = adjacency.shape[0]
+        outDegrees = np.diff(adjacency.indptr)
+        dangling = outDegrees == 0
+        inverseDegrees = np.divide(1.0, outDegrees, out=np.zeros(vertexCount), where=~dangling)
+        transposed = adjacency.T.tocsr()
+        rank = np.full(vertexCount, 1.0 / vertexCount)
+        for iteration in range(maxIterations):
+            base = (damping * rank[dangling].sum() + 1 - damping) / vertexCount
+            newRank = damping * (transposed @ (rank * inverseDegrees)) + base
+            change = np.abs(newRank - rank).sum()
+            rank = newRank
+            if change < tolerance:
+                break
+        return rank.tolist()
+
+
+def main():
+    edgeList = [('A', 'B'), ('A', 'C'), ('B', 'C'), ('B', 'D'),
+                ('C', 'D'), ('D', 'E'), ('E', 'F')]
+    ug = SimpleGraph()
+    ug.fromEdgeList(edgeList)
+    analytics = GraphAnalytics(ug)
+    print("The PageRank of every vertex is:")
+    print(analytics.pageRank())
+    print("\nThe degree histogram is:", analytics.degreeHistogram)
+    print("The triangles through every vertex are:", analytics.triangles)
+    print("The clustering coefficients are:", analytics.clusteringCoefficients)
+
+
+if __name__ == '__main__':
+    main()
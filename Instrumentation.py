@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+import inspect
+import threading
+import time
+
+import LinkedList
+from LinkedList import ChunkNode, DoublyNode, SinglyLinkedList, SinglyNode, SkipNode
+from SimpleGraph import SimpleGraph
+
+# counter slots of every operation
+CALLS, SECONDS, NODES_VISITED, ALLOCATIONS, VERTICES_VISITED, EDGES_VISITED = range(6)
+
+counterNames = ('calls', 'seconds', 'nodesVisited', 'allocations', 'verticesVisited', 'edgesVisited')
+
+# dunder methods that walk the list, instrumented along with the public methods
+tracedSpecialMethods = ('__contains__', '__getitem__', '__iter__', '__len__', '__reversed__')
+
+# methods whose walk happens in the iterator they return, generator or not
+iteratorMethods = ('__iter__', '__reversed__')
+
+
+class _CallState(threading.local):
+    # the counters of the outermost instrumented call running in this thread,
+    # and the (object id, method name) of every instrumented call under way
+    def __init__(self, unattributed):
+        self.counters = unattributed
+        self.activeCalls = set()
+
+
+class Instrumentation:
+    # opt-in counters for the linked lists and graph traversals. While enabled,
+    # every public method of the list classes in LinkedList.py, the link and
+    # constructor of every node class, and SimpleGraph.bfs/dfs are patched to
+    # count calls, time, nodes visited (link reads) and node allocations, or
+    # vertices and adjacency entries scanned. Nested calls are counted, but
+    # their nodes and time go to the outermost call; an override calling the
+    # same method through super() is one call. Disabling restores the
+    # original attributes, so there is no cost at all while it is off.
+    # Counts from several threads are not synchronised and may lose updates.
+    _enabledInstance = None
+
+    def __init__(self):
+        self._operations = dict()
+        self._unattributed = [0] * len(counterNames)
+        self._state = None
+        self._patches = list()
+
+    @property
+    def enabled(self):
+        return Instrumentation._enabledInstance is self
+
+    def disable(self):
+        if not self.enabled:
+            return
+        for owner, attributeName, original in reversed(self._patches):
+            setattr(owner, attributeName, original)
+        self._patches.clear()
+        Instrumentation._enabledInstance = None
+
+    def enable(self):
+        if self.enabled:
+            return
+        if Instrumentation._enabledInstance is not None:
+            raise RuntimeError("Another Instrumentation is already enabled")
+        Instrumentation._enabledInstance = self
+        self._state = _CallState(self._unattributed)
+        self._patchNodes()
+        self._patchLists()
+        self._patchGraphs()
+
+    def prometheus(self, prefix='adt'):
+        # the snapshot in the Prometheus text exposition format
+        lines = list()
+        snapshot = self.snapshot()
+        for counterName, metricName, helpText in (
+                ('calls', 'calls_total', "Calls of instrumented operations."),
+                ('seconds', 'seconds_total', "Time spent in outermost calls of instrumented operations."),
+                ('nodesVisited', 'nodes_visited_total', "Node links followed by list operations."),
+                ('allocations', 'allocations_total', "Nodes created by list operations."),
+                ('verticesVisited', 'vertices_visited_total', "Vertices reached by graph traversals."),
+                ('edgesVisited', 'edges_visited_total', "Adjacency entries scanned by graph traversals.")):
+            samples = [(operationName, counters[counterName]) for operationName, counters in snapshot.items()
+                       if counterName in counters]
+            if not samples:
+                continue
+            lines.append("# HELP {}_{} {}".format(prefix, metricName, helpText))
+            lines.append("# TYPE {}_{} counter".format(prefix, metricName))
+            for operationName, value in samples:
+                className, _, methodName = operationName.rpartition('.')
+                lines.append('{}_{}{{class="{}",method="{}"}} {}'.format(
+                    prefix, metricName, className, methodName, value))
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        self._operations.clear()
+        self._unattributed[:] = [0] * len(counterNames)
+
+    def snapshot(self):
+        # {'Class.method': {counter: value}} holding the counters that apply to
+        # the operation; links read and nodes made outside any instrumented
+        # call are reported under 'unattributed'
+        snapshot = dict()
+        for (className, methodName), counters in sorted(self._operations.items()):
+            if className == SimpleGraph.__name__:
+                fields = (CALLS, SECONDS, VERTICES_VISITED, EDGES_VISITED)
+            else:
+                fields = (CALLS, SECONDS, NODES_VISITED, ALLOCATIONS)
+            snapshot['{}.{}'.format(className, methodName)] = {counterNames[i]: counters[i] for i in fields}
+        if any(self._unattributed):
+            snapshot['unattributed'] = {counterNames[i]: self._unattributed[i] for i in (NODES_VISITED, ALLOCATIONS)}
+        return snapshot
+
+    def _counters(self, className, methodName):
+        key = (className, methodName)
+        counters = self._operations.get(key)
+        if counters is None:
+            counters = self._operations[key] = [0] * len(counterNames)
+        return counters
+
+    def _patch(self, owner, attributeName, replacement):
+        self._patches.append((owner, attributeName, owner.__dict__[attributeName]))
+        setattr(owner, attributeName, replacement)
+
+    def _patchGraphs(self):
+        for methodName in ('bfs', 'dfs'):
+            self._patch(SimpleGraph, methodName, self._tracedTraversal(methodName, getattr(SimpleGraph, methodName)))
+
+    def _patchLists(self):
+        for className, listClass in vars(LinkedList).items():
+            if (not inspect.isclass(listClass) or listClass.__module__ != LinkedList.__name__ or
+                    className.endswith('Node')):
+                continue
+            for methodName, method in list(vars(listClass).items()):
+                if inspect.isfunction(method) and (not methodName.startswith('_') or
+                                                   methodName in tracedSpecialMethods):
+                    self._patch(listClass, methodName, self._tracedMethod(methodName, method))
+
+    def _patchNodes(self):
+        state = self._state
+        for nodeClass, linkName in ((SinglyNode, 'next'), (DoublyNode, 'prev'),
+                                    (ChunkNode, 'next'), (SkipNode, 'next')):
+            self._patch(nodeClass, linkName, _countedLink(state, nodeClass.__dict__[linkName]))
+        for nodeClass in (SinglyNode, DoublyNode, ChunkNode, SkipNode):
+            self._patch(nodeClass, '__init__', _countedInit(state, nodeClass.__dict__['__init__']))
+
+    def _tracedMethod(self, methodName, method):
+        state, unattributed = self._state, self._unattributed
+        perfCounter = time.perf_counter
+
+        if inspect.isgeneratorfunction(method) or methodName in iteratorMethods:
+            def traced(listObject, *args, **kwargs):
+                callKey = (id(listObject), methodName)
+                if callKey in state.activeCalls:
+                    return method(listObject, *args, **kwargs)
+                counters = self._counters(type(listObject).__name__, methodName)
+                counters[CALLS] += 1
+                outermost = state.counters is unattributed
+                if outermost:
+                    state.counters = counters
+                    start = perfCounter()
+                state.activeCalls.add(callKey)
+                try:
+                    iterator = iter(method(listObject, *args, **kwargs))
+                finally:
+                    state.activeCalls.discard(callKey)
+                    if outermost:
+                        counters[SECONDS] += perfCounter() - start
+                        state.counters = unattributed
+                return _tracedGenerator(state, unattributed, counters, callKey, iterator)
+            return traced
+
+        def traced(listObject, *args, **kwargs):
+            # a super() call from an override already counted passes straight through
+            callKey = (id(listObject), methodName)
+            if callKey in state.activeCalls:
+                return method(listObject, *args, **kwargs)
+            counters = self._counters(type(listObject).__name__, methodName)
+            counters[CALLS] += 1
+            outermost = state.counters is unattributed
+            if outermost:
+                state.counters = counters
+                start = perfCounter()
+            state.activeCalls.add(callKey)
+            try:
+                return method(listObject, *args, **kwargs)
+            finally:
+                state.activeCalls.discard(callKey)
+                if outermost:
+                    counters[SECONDS] += perfCounter() - start
+                    state.counters = unattributed
+        return traced
+
+    def _tracedTraversal(self, methodName, method):
+        perfCounter = time.perf_counter
+
+        def traced(graph, srcName):
+            counters = self._counters(type(graph).__name__, methodName)
+            start = perfCounter()
+            visitSeq, visited = method(graph, srcName)
+            counters[SECONDS] += perfCounter() - start
+            counters[CALLS] += 1
+            # both searches scan the whole adjacency of every vertex they reach
+            counters[VERTICES_VISITED] += len(visitSeq)
+            vertexDict = graph._vertexDict
+            counters[EDGES_VISITED] += sum(len(vertexDict[vertexName]._adjDict) for vertexName in visitSeq)
+            return visitSeq, visited
+        return traced
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.disable()
+
+
+def _countedInit(state, init):
+    def countedInit(node, *args, **kwargs):
+        state.counters[ALLOCATIONS] += 1
+        init(node, *args, **kwargs)
+    return countedInit
+
+
+def _countedLink(state, slot):
+    # a property over the original slot descriptor that counts every read
+    getLink = slot.__get__
+
+    def readLink(node):
+        state.counters[NODES_VISITED] += 1
+        return getLink(node)
+    return property(readLink, slot.__set__)
+
+
+def _tracedGenerator(state, unattributed, counters, callKey, iterator):
+    # iteration is charged to the call that returned the iterator only while
+    # no other instrumented call is running, as for ordinary methods
+    perfCounter = time.perf_counter
+    while True:
+        outermost = state.counters is unattributed
+        if outermost:
+            state.counters = counters
+            start = perfCounter()
+        activeCalls = state.activeCalls
+        nested = callKey in activeCalls
+        activeCalls.add(callKey)
+        try:
+            value = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            if not nested:
+                activeCalls.discard(callKey)
+            if outermost:
+                counters[SECONDS] += perfCounter() - start
+                state.counters = unattributed
+        yield value
+
+
+def main():
+    instrumentation = Instrumentation()
+    with instrumentation:
+        linkedList = SinglyLinkedList()
+        linkedList.makeList([5, 3, 8, 1, 9, 2])
+        linkedList.insertAtEnd(7)
+        linkedList.getIndex(9)
+        linkedList.mergeSort()
+        ug = SimpleGraph()
+        ug.fromEdgeList([('A', 'B'), ('A', 'C'), ('B', 'C'), ('C', 'D')])
+        ug.bfs('A')
+        ug.dfs('A')
+    for operationName, counters in instrumentation.snapshot().items():
+        print(operationName, counters)
+    print()
+    print(instrumentation.prometheus(), end='')
+
+
+if __name__ == '__main__':
+    main()
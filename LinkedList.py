@@ -1,55 +1,109 @@
 #!/usr/bin/env python3
+from array import array
+from bisect import bisect_left
+from copy import deepcopy
+from itertools import chain, islice
+from operator import gt, ne
+from queue import Empty
+from random import random
+from threading import Condition, RLock
 
 
-class Node:
+class SinglyNode:
+    __slots__ = ('key', 'next')
+
+    def __init__(self, key=None, nextNode=None):
+        self.key = key
+        self.next = nextNode
+
+
+class DoublyNode(SinglyNode):
+    __slots__ = ('prev',)
+
     def __init__(self, key=None, nextNode=None, previousNode=None):
         self.key = key
         self.next = nextNode
         self.prev = previousNode
 
 
+Node = DoublyNode
+
+
+class ChunkNode:
+    __slots__ = ('keys', 'next')
+
+    def __init__(self, keys, nextNode=None):
+        self.keys = keys
+        self.next = nextNode
+
+
+class SkipNode:
+    __slots__ = ('key', 'next', 'width')
+
+    def __init__(self, key, height):
+        self.key = key
+        self.next = [None] * height
+        self.width = [1] * height
+
+
 class SinglyLinkedList:
     def __init__(self, head=None, size=0):
         self.head = head
+        self.tail = None
         self._size = size
+        # a cyclic chain, which hasCycle() then reports, has no tail to find
+        if head is not None and not self.hasCycle():
+            self.tail = head
+            while self.tail.next:
+                self.tail = self.tail.next
 
     def circularLeftShift(self, shift):
-        shift = shift % len(self)
-        if self.head is None or shift == 0:
+        self.rotate(-shift)
+
+    def concatenate(self, otherList):
+        # moves the nodes of otherList onto the end of this list, leaving it empty
+        if otherList is self:
+            raise ValueError("A list cannot be concatenated with itself.")
+        if isinstance(otherList, DoublyLinkedList) and otherList._reversed:
+            otherList._applyReversal()
+        if otherList.head is None:
             return
-        index = 0
-        currentNode = self.head
-        while currentNode:
-            if index == shift - 1:
-                lastNodeToBe = currentNode
-            if index == shift:
-                firstNodeToBe = currentNode
-            if currentNode.next is None:
-                currentLastNode = currentNode
-            index += 1
-            currentNode = currentNode.next
-        lastNodeToBe.next = None
-        currentLastNode.next = self.head
-        self.head = firstNodeToBe
+        if self.head is None:
+            self.head = otherList.head
+        else:
+            self.tail.next = otherList.head
+        self.tail = otherList.tail
+        self._size += len(otherList)
+        otherList._clear()
+
+    def copy(self):
+        # a shallow copy made in one pass, with exactly one new node per key
+        duplicateList = type(self)()
+        duplicateList.extend(self)
+        return duplicateList
+
+    def count(self, key):
+        return sum(1 for k in self if k == key)
 
     def deleteAtBeginning(self):
         if self.head is None:
             return
         self.head = self.head.next
+        if self.head is None:
+            self.tail = None
         self._size -= 1
 
     def deleteAtEnd(self):
         if self.head is None:
             return
-        currentNode = self.head
-        previousNode = None
-        while currentNode.next:
-            previousNode = currentNode
-            currentNode = currentNode.next
-        if previousNode is None:
-            self.head = currentNode.next
+        if self.head is self.tail:
+            self.head = self.tail = None
         else:
-            previousNode.next = currentNode.next
+            currentNode = self.head
+            while currentNode.next is not self.tail:
+                currentNode = currentNode.next
+            currentNode.next = None
+            self.tail = currentNode
         self._size -= 1
 
     def deleteAtIndex(self, index):
@@ -77,15 +131,39 @@ class SinglyLinkedList:
             self.head = currentNode.next
         else:
             previousNode.next = currentNode.next
+        if currentNode is self.tail:
+            self.tail = previousNode
         self._size -= 1
 
-    def getDuplicateList(self):
-        duplicateList = SinglyLinkedList()
+    def deleteMany(self, keys):
+        return self.deleteWhere(set(keys).__contains__)
+
+    def deleteWhere(self, predicate):
+        removed = 0
+        previousNode = None
         currentNode = self.head
         while currentNode:
-            duplicateList.insertAtBeginning(currentNode.key)
-            currentNode = currentNode.next
-        return duplicateList.getReverseList()
+            nextNode = currentNode.next
+            if predicate(currentNode.key):
+                if previousNode is None:
+                    self.head = nextNode
+                else:
+                    previousNode.next = nextNode
+                removed += 1
+            else:
+                previousNode = currentNode
+            currentNode = nextNode
+        self.tail = previousNode
+        self._size -= removed
+        return removed
+
+    def extend(self, iterable):
+        self.insertManyAtIndex(iterable, len(self))
+
+    def getDuplicateList(self):
+        duplicateList = SinglyLinkedList()
+        duplicateList.extend(self)
+        return duplicateList
 
     def getIndex(self, key):
         currentNode = self.head
@@ -129,20 +207,26 @@ class SinglyLinkedList:
                 return True
         return False
 
+    def index(self, key):
+        index = self.getIndex(key)
+        if index == -1:
+            raise ValueError("'{}' does not exit in the list.".format(key))
+        return index
+
     def insertAtBeginning(self, key):
-        newNode = Node(key, self.head)
+        newNode = SinglyNode(key, self.head)
         self.head = newNode
+        if self.tail is None:
+            self.tail = newNode
         self._size += 1
 
     def insertAtEnd(self, key):
         if self.head is None:
             self.insertAtBeginning(key)
             return
-        currentNode = self.head
-        while currentNode.next:
-            currentNode = currentNode.next
-        newNode = Node(key, None)
-        currentNode.next = newNode
+        newNode = SinglyNode(key, None)
+        self.tail.next = newNode
+        self.tail = newNode
         self._size += 1
 
     def insertAtIndex(self, key, index):
@@ -157,14 +241,34 @@ class SinglyLinkedList:
             for i in range(index):
                 previousNode = currentNode
                 currentNode = currentNode.next
-            newNode = Node(key, currentNode)
+            newNode = SinglyNode(key, currentNode)
             previousNode.next = newNode
             self._size += 1
 
+    def insertManyAtIndex(self, iterable, index):
+        if index not in range(len(self) + 1):
+            raise IndexError("Index must be in range [0, {}].".format(len(self)))
+        firstNode, lastNode, count = self._buildChain(iterable)
+        if firstNode is None:
+            return
+        if index == 0:
+            lastNode.next = self.head
+            self.head = firstNode
+        else:
+            previousNode = self.tail if index == len(self) else self._nodeAt(index - 1)
+            lastNode.next = previousNode.next
+            previousNode.next = firstNode
+        if lastNode.next is None:
+            self.tail = lastNode
+        self._size += count
+
     def isEmpty(self):
         return not self.head
 
     def isEqual(self, otherList):
+        # the nodes of a doubly linked list with a pending reverse are not in its order yet
+        if isinstance(otherList, DoublyLinkedList) and otherList._reversed:
+            otherList._applyReversal()
         firstListNode = self.head
         secondListNode = otherList.head
         while firstListNode and secondListNode:
@@ -187,16 +291,32 @@ class SinglyLinkedList:
         return True
 
     def makeList(self, iterable):
-        for i in iterable:
-            self.insertAtEnd(i)
+        self.extend(iterable)
 
-    def mergeSort(self):
+    def mergeSort(self, key=None, reverse=False):
         if self.head is None or self.head.next is None:
             return self
-        left, right = self._splitList()
-        left = left.mergeSort()
-        right = right.mergeSort()
-        return left._merge(right)
+        isOutOfOrder = self._outOfOrderTest(key, reverse)
+        # pendingRuns[i] is None or 2**i natural runs merged into one, like the
+        # digits of a binary counter, so only O(log n) runs wait at any time
+        pendingRuns = list()
+        for run in self._splitRuns(isOutOfOrder):
+            level = 0
+            while level < len(pendingRuns) and pendingRuns[level] is not None:
+                run = self._mergeRuns(pendingRuns[level], run, isOutOfOrder)
+                pendingRuns[level] = None
+                level += 1
+            if level == len(pendingRuns):
+                pendingRuns.append(run)
+            else:
+                pendingRuns[level] = run
+        # the higher levels hold the earlier runs
+        run = None
+        for pendingRun in pendingRuns:
+            if pendingRun is not None:
+                run = pendingRun if run is None else self._mergeRuns(pendingRun, run, isOutOfOrder)
+        self.head, self.tail = run
+        return self
 
     def printList(self):
         currentNode = self.head
@@ -208,18 +328,45 @@ class SinglyLinkedList:
             currentNode = currentNode.next
         print()
 
+    def reverse(self):
+        # relinks the nodes in place with O(1) extra memory
+        previousNode = None
+        currentNode = self.tail = self.head
+        while currentNode:
+            nextNode = currentNode.next
+            currentNode.next = previousNode
+            previousNode = currentNode
+            currentNode = nextNode
+        self.head = previousNode
+
+    def rotate(self, k=1):
+        # same direction as collections.deque.rotate: a positive k moves the
+        # last k keys to the front, a negative k moves the first keys to the back
+        if len(self) < 2:
+            return
+        k = k % len(self)
+        if k == 0:
+            return
+        newTail = self._nodeAt(len(self) - k - 1)
+        self.tail.next = self.head
+        self.head = newTail.next
+        newTail.next = None
+        self.tail = newTail
+
     def sortedInsertion(self, key):
         if self.head is None:
             self.insertAtBeginning(key)
         elif self.head.key >= key:
-            newNode = Node(key, self.head)
+            newNode = SinglyNode(key, self.head)
             self.head = newNode
             self._size += 1
+        elif self.tail.key < key:
+            self.insertAtEnd(key)
         else:
             currentNode = self.head
             while currentNode.next and currentNode.next.key < key:
                 currentNode = currentNode.next
-            newNode = Node(key, currentNode.next)
+            newNode = SinglyNode(key, currentNode.next)
             currentNode.next = newNode
             self._size += 1
 
@@ -256,16 +403,15 @@ class SinglyLinkedList:
             self.head = yNode
         else:
             previousX.next = yNode
+        if yNode is self.tail:
+            self.tail = xNode
         previousY.next = xNode
         xNode.next, yNode.next = yNode.next, xNode.next
 
     def updateAtIndex(self, index, key):
         if index not in range(len(self)):
             raise IndexError("Index must be in range [0, {}].".format(len(self) - 1))
-        currentNode = self.head
-        for i in range(index):
-            currentNode = currentNode.next
-        currentNode.key = key
+        self._nodeAt(index).key = key
 
     def updateKey(self, oldKey, newKey):
         if self.head is None:
@@ -276,6 +422,23 @@ class SinglyLinkedList:
             raise ValueError("'{}' does not exit in the list.".format(oldKey))
         currentNode.key = newKey
 
+    def _buildChain(self, iterable):
+        firstNode = lastNode = None
+        count = 0
+        for key in iterable:
+            newNode = SinglyNode(key)
+            if lastNode is None:
+                firstNode = newNode
+            else:
+                lastNode.next = newNode
+            lastNode = newNode
+            count += 1
+        return firstNode, lastNode, count
+
+    def _clear(self):
+        self.head = self.tail = None
+        self._size = 0
+
     def _getPreviousAndCurrentNode(self, key):
         currentNode = self.head
         previousNode = None
@@ -288,35 +451,101 @@ class SinglyLinkedList:
             currentNode = currentNode.next
         return found, previousNode, currentNode
 
-    def _merge(self, otherList):
-        firstListNode = self.head
-        secondListNode = otherList.head
-        mergedList = SinglyLinkedList()
-        while firstListNode and secondListNode:
-            if firstListNode.key <= secondListNode.key:
-                mergedList.insertAtBeginning(firstListNode.key)
-                firstListNode = firstListNode.next
+    def _mergeRuns(self, firstRun, secondRun, isOutOfOrder):
+        firstNode, firstTail = firstRun
+        secondNode, secondTail = secondRun
+        if not isOutOfOrder(firstTail, secondNode):
+            firstTail.next = secondNode
+            return firstNode, secondTail
+        if isOutOfOrder(firstNode, secondNode):
+            mergedHead = secondNode
+            secondNode = secondNode.next
+        else:
+            mergedHead = firstNode
+            firstNode = firstNode.next
+        mergedTail = mergedHead
+        while firstNode and secondNode:
+            if isOutOfOrder(firstNode, secondNode):
+                mergedTail.next = secondNode
+                mergedTail = secondNode
+                secondNode = secondNode.next
             else:
-                mergedList.insertAtBeginning(secondListNode.key)
-                secondListNode = secondListNode.next
-        while firstListNode:
-            mergedList.insertAtBeginning(firstListNode.key)
-            firstListNode = firstListNode.next
-        while secondListNode:
-            mergedList.insertAtBeginning(secondListNode.key)
-            secondListNode = secondListNode.next
-        return mergedList.getReverseList()
-
-    def _splitList(self):
-        if self.head is None or self.head.next is None:
-            left = SinglyLinkedList(self.head)
-            right = SinglyLinkedList()
+                mergedTail.next = firstNode
+                mergedTail = firstNode
+                firstNode = firstNode.next
+        if firstNode:
+            mergedTail.next = firstNode
+            mergedTail = firstTail
         else:
-            middleNode = self.getMiddleNode()
-            left = SinglyLinkedList(self.head)
-            right = SinglyLinkedList(middleNode.next)
-            middleNode.next = None
-        return left, right
+            mergedTail.next = secondNode
+            mergedTail = secondTail
+        return mergedHead, mergedTail
+
+    def _nodeAt(self, index):
+        currentNode = self.head
+        for i in range(index):
+            currentNode = currentNode.next
+        return currentNode
+
+    def _outOfOrderTest(self, key, reverse):
+        # tells whether the right node must come strictly before the left one,
+        # so that equal keys are never reordered
+        if key is None:
+            if reverse:
+                return lambda left, right: left.key < right.key
+            return lambda left, right: right.key < left.key
+        if reverse:
+            return lambda left, right: key(left.key) < key(right.key)
+        return lambda left, right: key(right.key) < key(left.key)
+
+    def _splitRuns(self, isOutOfOrder):
+        # yields the runs one at a time; each is cut off before it is yielded,
+        # so merging it cannot disturb the part still to be split
+        currentNode = self.head
+        while currentNode:
+            runHead = runTail = currentNode
+            currentNode = currentNode.next
+            if currentNode and isOutOfOrder(runTail, currentNode):
+                # a strictly descending run can be reversed without breaking stability
+                runTail.next = None
+                while currentNode and isOutOfOrder(runHead, currentNode):
+                    nextNode = currentNode.next
+                    currentNode.next = runHead
+                    runHead = currentNode
+                    currentNode = nextNode
+            else:
+                while currentNode and not isOutOfOrder(runTail, currentNode):
+                    runTail = currentNode
+                    currentNode = currentNode.next
+                runTail.next = None
+            yield runHead, runTail
+
+    def __contains__(self, key):
+        return self.getIndex(key) != -1
+
+    def __copy__(self):
+        return self.copy()
+
+    def __deepcopy__(self, memo):
+        duplicateList = type(self)()
+        memo[id(self)] = duplicateList
+        duplicateList.extend(deepcopy(key, memo) for key in self)
+        return duplicateList
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return LinkedListView(self, range(*index.indices(len(self))))
+        if index < 0:
+            index += len(self)
+        if index not in range(len(self)):
+            raise IndexError("Index must be in range [0, {}].".format(len(self) - 1))
+        return self._nodeAt(index).key
+
+    def __iter__(self):
+        currentNode = self.head
+        while currentNode:
+            yield currentNode.key
+            currentNode = currentNode.next
 
     def __len__(self):
         return self._size
@@ -327,67 +556,49 @@ class SinglyLinkedList:
         #     currentNode = currentNode.next
         # return size
 
+    def __reversed__(self):
+        # there are no back links to follow, so the keys are buffered first
+        return reversed(list(self))
+
 
 class DoublyLinkedList(SinglyLinkedList):
+    # reverse() only flips a flag, leaving every node and head and tail as they
+    # are. Iteration and the operations at the two ends follow the flag; any
+    # other operation that depends on the order relinks the nodes first, once,
+    # so reversing twice in a row costs nothing
     def __init__(self, head=None, size=0):
-        self.head = head
-        self._size = size
+        self._reversed = False
+        super().__init__(head, size)
 
-    def circularLeftShift(self, shift):
-        shift = shift % len(self)
-        if self.head is None or shift == 0:
+    def concatenate(self, otherList):
+        if not isinstance(otherList, DoublyLinkedList):
+            raise TypeError("Only a doubly linked list can be concatenated to a doubly linked list.")
+        if otherList is self:
+            raise ValueError("A list cannot be concatenated with itself.")
+        if otherList.head is None:
             return
-        index = 0
-        currentNode = self.head
-        while currentNode:
-            if index == shift - 1:
-                lastNodeToBe = currentNode
-            if index == shift:
-                firstNodeToBe = currentNode
-            if currentNode.next is None:
-                currentLastNode = currentNode
-            index += 1
-            currentNode = currentNode.next
-        lastNodeToBe.next = None
-        lastNodeToBe.prev = currentLastNode
-        currentLastNode.next = self.head
-        self.head = firstNodeToBe
-        firstNodeToBe.prev = None
+        if self._reversed:
+            self._applyReversal()
+        if otherList._reversed:
+            otherList._applyReversal()
+        firstNode, lastNode, count = otherList.head, otherList.tail, len(otherList)
+        otherList._clear()
+        self._spliceChain(firstNode, lastNode, count, self.tail, None)
 
     def deleteAtBeginning(self):
         if self.head is None:
             return
-        self.head = self.head.next
-        if self.head is not None:
-            self.head.prev = None
-        self._size -= 1
+        self._unlinkNode(self.tail if self._reversed else self.head)
 
     def deleteAtEnd(self):
         if self.head is None:
             return
-        currentNode = self.head
-        while currentNode.next:
-            currentNode = currentNode.next
-        if currentNode.prev is None:
-            self.head = currentNode.next
-        else:
-            currentNode.prev.next = currentNode.next
-        self._size -= 1
+        self._unlinkNode(self.head if self._reversed else self.tail)
 
     def deleteAtIndex(self, index):
         if index not in range(len(self)):
             raise IndexError("Index must be in range [0, {}].".format(len(self) - 1))
-        if index == 0:
-            self.deleteAtBeginning()
-        elif index == len(self) - 1:
-            self.deleteAtEnd()
-        else:
-            currentNode = self.head
-            for i in range(index):
-                currentNode = currentNode.next
-            currentNode.prev.next = currentNode.next
-            currentNode.next.prev = currentNode.prev
-            self._size -= 1
+        self._unlinkNode(self._nodeAt(index))
 
     def deleteKey(self, key):
         if self.head is None:
@@ -395,69 +606,104 @@ class DoublyLinkedList(SinglyLinkedList):
         found, previousNode, currentNode = self._getPreviousAndCurrentNode(key)
         if not found:
             raise ValueError("'{}' does not exit in the list.".format(key))
-        if previousNode is None:
-            self.head = currentNode.next
-            currentNode.next.prev = None
-        else:
-            previousNode.next = currentNode.next
-            if currentNode.next:
-                currentNode.next.prev = previousNode
-        self._size -= 1
+        self._unlinkNode(currentNode)
 
-    def getDuplicateList(self):
-        duplicateList = DoublyLinkedList()
+    def deleteWhere(self, predicate):
+        removed = 0
         currentNode = self.head
         while currentNode:
-            duplicateList.insertAtBeginning(currentNode.key)
-            currentNode = currentNode.next
-        return duplicateList.getReverseList()
+            nextNode = currentNode.next
+            if predicate(currentNode.key):
+                self._unlinkNode(currentNode)
+                removed += 1
+            currentNode = nextNode
+        return removed
+
+    def getDuplicateList(self):
+        duplicateList = DoublyLinkedList()
+        duplicateList.extend(self)
+        return duplicateList
+
+    def getIndex(self, key):
+        if self._reversed:
+            self._applyReversal()
+        return super().getIndex(key)
+
+    def getMiddleNode(self):
+        if self._reversed:
+            self._applyReversal()
+        return super().getMiddleNode()
 
     def getReverseList(self):
-        currentNode = self.head
         revList = DoublyLinkedList()
-        while currentNode:
-            revList.insertAtBeginning(currentNode.key)
-            currentNode = currentNode.next
+        revList.extend(reversed(self))
         return revList
 
     def insertAtBeginning(self, key):
-        newNode = Node(key, self.head, None)
-        if self.head:
-            self.head.prev = newNode
-        self.head = newNode
-        self._size += 1
+        if self._reversed:
+            self._insertBetween(key, self.tail, None)
+        else:
+            self._insertBetween(key, None, self.head)
 
     def insertAtEnd(self, key):
-        if self.head is None:
-            self.insertAtBeginning(key)
-            return
-        currentNode = self.head
-        while currentNode.next:
-            currentNode = currentNode.next
-        newNode = Node(key, None, currentNode)
-        currentNode.next = newNode
-        self._size += 1
+        if self._reversed:
+            self._insertBetween(key, None, self.head)
+        else:
+            self._insertBetween(key, self.tail, None)
 
     def insertAtIndex(self, key, index):
         if index not in range(len(self) + 1):
             raise IndexError("Index must be in range [0, {}].".format(len(self)))
-        if index == 0:
-            self.insertAtBeginning(key)
-        elif index == len(self):
+        if index == len(self):
             self.insertAtEnd(key)
         else:
-            currentNode = self.head
-            for i in range(index):
-                currentNode = currentNode.next
-            newNode = Node(key, currentNode, currentNode.prev)
-            currentNode.prev.next = newNode
-            currentNode.prev = newNode
-            self._size += 1
+            nextNode = self._nodeAt(index)
+            self._insertBetween(key, nextNode.prev, nextNode)
 
-    def printReverseList(self):
+    def insertManyAtIndex(self, iterable, index):
+        if index not in range(len(self) + 1):
+            raise IndexError("Index must be in range [0, {}].".format(len(self)))
+        firstNode, lastNode, count = self._buildChain(iterable)
+        if firstNode is None:
+            return
+        if self._reversed:
+            self._applyReversal()
+        nextNode = None if index == len(self) else self._nodeAt(index)
+        previousNode = self.tail if nextNode is None else nextNode.prev
+        self._spliceChain(firstNode, lastNode, count, previousNode, nextNode)
+
+    def isEqual(self, otherList):
+        if self._reversed:
+            self._applyReversal()
+        return super().isEqual(otherList)
+
+    def isSorted(self):
+        if self._reversed:
+            self._applyReversal()
+        return super().isSorted()
+
+    def mergeSort(self, key=None, reverse=False):
+        # the order of equal keys is kept, so it has to be the current order
+        if self._reversed:
+            self._applyReversal()
+        super().mergeSort(key, reverse)
+        previousNode = None
         currentNode = self.head
-        while currentNode.next:
+        while currentNode:
+            currentNode.prev = previousNode
+            previousNode = currentNode
             currentNode = currentNode.next
+        return self
+
+    def printList(self):
+        if self._reversed:
+            self._applyReversal()
+        super().printList()
+
+    def printReverseList(self):
+        if self._reversed:
+            self._applyReversal()
+        currentNode = self.tail
         while currentNode:
             if currentNode.next is None:
                 print(currentNode.key, end='')
@@ -466,72 +712,74 @@ class DoublyLinkedList(SinglyLinkedList):
             currentNode = currentNode.prev
         print()
 
+    def reverse(self):
+        self._reversed = not self._reversed
+
     def reverseList(self):
-        if self.head is None or self.head.next is None:
+        # relinks the nodes right away, or just drops a pending reverse
+        self._reversed = not self._reversed
+        if self._reversed:
+            self._applyReversal()
+
+    def rotate(self, k=1):
+        if len(self) < 2:
             return
-        currentNode = self.head
-        while currentNode:
-            if currentNode.next is None:
-                self.head = currentNode
-            currentNode.prev, currentNode.next = currentNode.next, currentNode.prev
-            currentNode = currentNode.prev
+        k = k % len(self)
+        if k == 0:
+            return
+        # _nodeAt walks from the nearer end, so rotating by one either way is O(1)
+        newTail = self._nodeAt(len(self) - k - 1)
+        self._link(self.tail, self.head)
+        self.head = newTail.next
+        self.head.prev = None
+        newTail.next = None
+        self.tail = newTail
 
     def sortedInsertion(self, key):
-        if self.head is None:
+        if self._reversed:
+            self._applyReversal()
+        if self.head is None or self.head.key >= key:
             self.insertAtBeginning(key)
-        elif self.head.key >= key:
-            newNode = Node(key, self.head, None)
-            self.head.prev = newNode
-            self.head = newNode
-            self._size += 1
+        elif self.tail.key < key:
+            self.insertAtEnd(key)
         else:
             currentNode = self.head
             while currentNode.next and currentNode.next.key < key:
                 currentNode = currentNode.next
-            newNode = Node(key, currentNode.next, currentNode)
-            currentNode.next.prev = newNode
-            currentNode.next = newNode
-            self._size += 1
+            self._insertBetween(key, currentNode, currentNode.next)
 
     def swapNodes(self, x, y):
         if self.head is None or x == y:
             return
+        if self._reversed:
+            self._applyReversal()
         currentNode = self.head
         xNode = yNode = None
-        xIndex = yIndex = index = 0
         while currentNode:
             if xNode and yNode:
                 break
             if currentNode.key == x:
                 xNode = currentNode
-                xIndex = index
             if currentNode.key == y:
                 yNode = currentNode
-                yIndex = index
             currentNode = currentNode.next
-            index += 1
         if xNode is None:
             raise ValueError("'{}' does not exit in the list.".format(x))
         if yNode is None:
             raise ValueError("'{}' does not exit in the list.".format(y))
-        if xIndex > yIndex:
-            xNode, yNode = yNode, xNode
-        if xNode.prev is None:  # is xNode the first node?
-            self.head = yNode
-        else:
-            xNode.prev.next = yNode
-        if yNode.next is not None:  # is yNode the last node?
-            yNode.next.prev = xNode
-        if xNode.next == yNode:  # are the nodes adjacent?
-            xNode.next, yNode.next = yNode.next, xNode
-            xNode.prev, yNode.prev = yNode, xNode.prev
-        else:
-            yNode.prev.next = xNode
-            xNode.next.prev = yNode
-            xNode.prev, yNode.prev = yNode.prev, xNode.prev
-            xNode.next, yNode.next = yNode.next, xNode.next
+        self._swapLinkedNodes(xNode, yNode)
+
+    def _applyReversal(self):
+        self._reversed = False
+        currentNode = self.head
+        while currentNode:
+            currentNode.prev, currentNode.next = currentNode.next, currentNode.prev
+            currentNode = currentNode.prev
+        self.head, self.tail = self.tail, self.head
 
     def _getPreviousAndCurrentNode(self, key):
+        if self._reversed:
+            self._applyReversal()
         currentNode = self.head
         previousNode = None
         found = False
@@ -544,36 +792,1487 @@ class DoublyLinkedList(SinglyLinkedList):
             previousNode = currentNode.prev
         return found, previousNode, currentNode
 
-    def _merge(self, otherList):
-        firstListNode = self.head
-        secondListNode = otherList.head
-        mergedList = DoublyLinkedList()
-        while firstListNode and secondListNode:
-            if firstListNode.key <= secondListNode.key:
-                mergedList.insertAtBeginning(firstListNode.key)
-                firstListNode = firstListNode.next
+    def _buildChain(self, iterable):
+        firstNode = lastNode = None
+        count = 0
+        for key in iterable:
+            newNode = DoublyNode(key, None, lastNode)
+            if lastNode is None:
+                firstNode = newNode
             else:
-                mergedList.insertAtBeginning(secondListNode.key)
-                secondListNode = secondListNode.next
-        while firstListNode:
-            mergedList.insertAtBeginning(firstListNode.key)
-            firstListNode = firstListNode.next
-        while secondListNode:
-            mergedList.insertAtBeginning(secondListNode.key)
-            secondListNode = secondListNode.next
-        return mergedList.getReverseList()
+                lastNode.next = newNode
+            lastNode = newNode
+            count += 1
+        return firstNode, lastNode, count
 
-    def _splitList(self):
-        if self.head is None or self.head.next is None:
-            left = DoublyLinkedList(self.head)
-            right = DoublyLinkedList()
+    def _clear(self):
+        super()._clear()
+        self._reversed = False
+
+    def _insertBetween(self, key, previousNode, nextNode):
+        newNode = DoublyNode(key, nextNode, previousNode)
+        self._link(previousNode, newNode)
+        self._link(newNode, nextNode)
+        self._size += 1
+        return newNode
+
+    def _link(self, leftNode, rightNode):
+        # a missing neighbour means the other node becomes the head or the tail
+        if leftNode is None:
+            self.head = rightNode
+        else:
+            leftNode.next = rightNode
+        if rightNode is None:
+            self.tail = leftNode
+        else:
+            rightNode.prev = leftNode
+
+    def _nodeAt(self, index):
+        if self._reversed:
+            self._applyReversal()
+        if index <= len(self) // 2:
+            return super()._nodeAt(index)
+        currentNode = self.tail
+        for i in range(len(self) - 1 - index):
+            currentNode = currentNode.prev
+        return currentNode
+
+    def _spliceChain(self, firstNode, lastNode, count, previousNode, nextNode):
+        self._link(previousNode, firstNode)
+        self._link(lastNode, nextNode)
+        self._size += count
+
+    def _swapLinkedNodes(self, xNode, yNode):
+        if yNode.next is xNode:
+            xNode, yNode = yNode, xNode
+        previousX, nextY = xNode.prev, yNode.next
+        if xNode.next is yNode:  # are the nodes adjacent?
+            self._link(previousX, yNode)
+            self._link(yNode, xNode)
+            self._link(xNode, nextY)
         else:
-            middleNode = self.getMiddleNode()
-            left = DoublyLinkedList(self.head)
-            right = DoublyLinkedList(middleNode.next)
-            middleNode.next.prev = None
-            middleNode.next = None
-        return left, right
+            nextX, previousY = xNode.next, yNode.prev
+            self._link(previousX, yNode)
+            self._link(yNode, nextX)
+            self._link(previousY, xNode)
+            self._link(xNode, nextY)
+
+    def _unlinkNode(self, node):
+        # the removed node keeps its own links so that walkers already on it can
+        # move on; nodes relinked in place give no such guarantee
+        self._link(node.prev, node.next)
+        self._size -= 1
+
+    def __iter__(self):
+        if self._reversed:
+            return _backwardKeys(self.tail)
+        return _forwardKeys(self.head)
+
+    def __reversed__(self):
+        if self._reversed:
+            return _forwardKeys(self.head)
+        return _backwardKeys(self.tail)
+
+
+class IndexedDoublyLinkedList(DoublyLinkedList):
+    # keeps a dictionary from each key to its node, or to a set of nodes when
+    # the key repeats, so key lookups, deletes and swaps skip the linear scan
+    def __init__(self, head=None, size=0):
+        super().__init__(head, size)
+        self._index = dict()
+        # only a chain that ends can be walked, which is when a tail was found
+        currentNode = self.head if self.tail is not None else None
+        while currentNode:
+            self._addToIndex(currentNode)
+            currentNode = currentNode.next
+
+    def count(self, key):
+        entry = self._index.get(key)
+        if entry is None:
+            return 0
+        if isinstance(entry, set):
+            return len(entry)
+        return 1
+
+    def deleteMany(self, keys):
+        removed = 0
+        for key in set(keys):
+            entry = self._index.get(key)
+            if entry is None:
+                continue
+            nodes = list(entry) if isinstance(entry, set) else [entry]
+            for node in nodes:
+                self._unlinkNode(node)
+            removed += len(nodes)
+        return removed
+
+    def getIndex(self, key):
+        # counting back links only gives the position once a pending reverse is applied
+        if self._reversed:
+            self._applyReversal()
+        currentNode = self._firstNode(key)
+        if currentNode is None:
+            return -1
+        index = 0
+        while currentNode.prev:
+            currentNode = currentNode.prev
+            index += 1
+        return index
+
+    def swapNodes(self, x, y):
+        if self.head is None or x == y:
+            return
+        xNode, yNode = self._firstNode(x), self._firstNode(y)
+        if xNode is None:
+            raise ValueError("'{}' does not exit in the list.".format(x))
+        if yNode is None:
+            raise ValueError("'{}' does not exit in the list.".format(y))
+        self._swapLinkedNodes(xNode, yNode)
+
+    def updateAtIndex(self, index, key):
+        if index not in range(len(self)):
+            raise IndexError("Index must be in range [0, {}].".format(len(self) - 1))
+        self._rekeyNode(self._nodeAt(index), key)
+
+    def updateKey(self, oldKey, newKey):
+        if self.head is None:
+            return
+        currentNode = self._firstNode(oldKey)
+        if currentNode is None:
+            raise ValueError("'{}' does not exit in the list.".format(oldKey))
+        self._rekeyNode(currentNode, newKey)
+
+    def _addToIndex(self, node):
+        entry = self._index.get(node.key)
+        if entry is None:
+            self._index[node.key] = node
+        elif isinstance(entry, set):
+            entry.add(node)
+        else:
+            self._index[node.key] = {entry, node}
+
+    def _clear(self):
+        super()._clear()
+        self._index.clear()
+
+    def _firstNode(self, key):
+        entry = self._index.get(key)
+        if entry is None or not isinstance(entry, set):
+            return entry
+        # a repeated key has no order in the set, so walk to its first occurrence
+        if self._reversed:
+            self._applyReversal()
+        currentNode = self.head
+        while currentNode not in entry:
+            currentNode = currentNode.next
+        return currentNode
+
+    def _getPreviousAndCurrentNode(self, key):
+        currentNode = self._firstNode(key)
+        if currentNode is None:
+            return False, None, None
+        return True, currentNode.prev, currentNode
+
+    def _insertBetween(self, key, previousNode, nextNode):
+        newNode = super()._insertBetween(key, previousNode, nextNode)
+        self._addToIndex(newNode)
+        return newNode
+
+    def _rekeyNode(self, node, key):
+        self._removeFromIndex(node)
+        node.key = key
+        self._addToIndex(node)
+
+    def _removeFromIndex(self, node):
+        entry = self._index[node.key]
+        if isinstance(entry, set):
+            entry.discard(node)
+            if len(entry) == 1:
+                self._index[node.key] = entry.pop()
+        else:
+            del self._index[node.key]
+
+    def _spliceChain(self, firstNode, lastNode, count, previousNode, nextNode):
+        currentNode = firstNode
+        while currentNode is not lastNode:
+            self._addToIndex(currentNode)
+            currentNode = currentNode.next
+        self._addToIndex(lastNode)
+        super()._spliceChain(firstNode, lastNode, count, previousNode, nextNode)
+
+    def _unlinkNode(self, node):
+        super()._unlinkNode(node)
+        self._removeFromIndex(node)
+
+    def __contains__(self, key):
+        return key in self._index
+
+
+class ConcurrentDoublyLinkedList(DoublyLinkedList):
+    # writers are serialised by a lock while readers never take it. Removing a
+    # node leaves its own links alone, so a walk that is already on it still
+    # reaches the rest of the list, though a positional read can find the
+    # list shorter than it was and raises IndexError then. mergeSort, reverseList, rotate and
+    # swapNodes would relink many nodes under a walk, so they build the new
+    # order from fresh nodes and then point head and tail at it: a walk that
+    # started earlier sees the whole old order, at an O(n) cost even for a
+    # rotate by one. For the same reason reverse() is never left pending. The
+    # version counter is odd while a write is in progress, which lets
+    # snapshot() take a consistent copy optimistically and only fall back to
+    # the lock under contention.
+    # "with workQueue:" groups several calls into a single write; a blocking
+    # pop inside the group splits it while it waits, so producers can get in.
+    def __init__(self, head=None, size=0):
+        super().__init__(head, size)
+        self._lock = RLock()
+        self._notEmpty = Condition(self._lock)
+        self._version = 0
+        self._writers = 0
+
+    def concatenate(self, otherList):
+        with self:
+            super().concatenate(otherList)
+
+    def copy(self):
+        duplicateList = type(self)()
+        duplicateList.extend(self.snapshot())
+        return duplicateList
+
+    def deleteAtBeginning(self):
+        with self:
+            super().deleteAtBeginning()
+
+    def deleteAtEnd(self):
+        with self:
+            super().deleteAtEnd()
+
+    def deleteAtIndex(self, index):
+        with self:
+            super().deleteAtIndex(index)
+
+    def deleteKey(self, key):
+        with self:
+            super().deleteKey(key)
+
+    def deleteWhere(self, predicate):
+        with self:
+            return super().deleteWhere(predicate)
+
+    def extend(self, iterable):
+        # the length read and the splice at it must be one write
+        with self:
+            super().extend(iterable)
+
+    def getMiddleNode(self):
+        # every link is read once, as a removal at the end may clear it meanwhile
+        slowNode = self.head
+        fastNode = None if slowNode is None else slowNode.next
+        while fastNode is not None:
+            fastNode, nextNode = fastNode.next, slowNode.next
+            if fastNode is None or nextNode is None:
+                break
+            slowNode, fastNode = nextNode, fastNode.next
+        return slowNode
+
+    def insertAtBeginning(self, key):
+        with self:
+            super().insertAtBeginning(key)
+
+    def insertAtEnd(self, key):
+        with self:
+            super().insertAtEnd(key)
+
+    def insertAtIndex(self, key, index):
+        with self:
+            super().insertAtIndex(key, index)
+
+    def insertManyAtIndex(self, iterable, index):
+        with self:
+            super().insertManyAtIndex(iterable, index)
+
+    def makeList(self, iterable):
+        with self:
+            super().makeList(iterable)
+
+    def mergeSort(self, key=None, reverse=False):
+        with self:
+            self._publishChain(sorted(self, key=key, reverse=reverse))
+        return self
+
+    def popAtBeginning(self, block=True, timeout=None):
+        return self._pop(True, block, timeout)
+
+    def popAtEnd(self, block=True, timeout=None):
+        return self._pop(False, block, timeout)
+
+    def reverse(self):
+        self.reverseList()
+
+    def reverseList(self):
+        with self:
+            self._publishChain(reversed(self))
+
+    def rotate(self, k=1):
+        with self:
+            if len(self) < 2 or k % len(self) == 0:
+                return
+            keys = list(self)
+            k = k % len(keys)
+            self._publishChain(keys[-k:] + keys[:-k])
+
+    def snapshot(self, retries=3):
+        for attempt in range(retries):
+            version = self._version
+            if version % 2 == 0:
+                keys = list(self)
+                if self._version == version:
+                    return keys
+        with self._lock:
+            return list(self)
+
+    def sortedInsertion(self, key):
+        with self:
+            super().sortedInsertion(key)
+
+    def swapNodes(self, x, y):
+        with self:
+            super().swapNodes(x, y)
+
+    def updateAtIndex(self, index, key):
+        with self:
+            super().updateAtIndex(index, key)
+
+    def updateKey(self, oldKey, newKey):
+        with self:
+            super().updateKey(oldKey, newKey)
+
+    def _nodeAt(self, index):
+        # a lock-free walk may find the list shorter than the length it was
+        # given, as removals at the far end clear the links it follows
+        if index <= len(self) // 2:
+            currentNode = self.head
+            for i in range(index):
+                if currentNode is None:
+                    break
+                currentNode = currentNode.next
+        else:
+            currentNode = self.tail
+            for i in range(len(self) - 1 - index):
+                if currentNode is None:
+                    break
+                currentNode = currentNode.prev
+        if currentNode is None:
+            raise IndexError("Index must be in range [0, {}].".format(len(self) - 1))
+        return currentNode
+
+    def _pop(self, fromBeginning, block, timeout):
+        with self._lock:
+            if self.head is None:
+                # waiting releases the lock however deep this thread holds it, so a
+                # write group it is inside is closed meanwhile and reopened after:
+                # the writers that fill the list must see themselves as outermost
+                writers, self._writers = self._writers, 0
+                if writers:
+                    self._version += 1
+                try:
+                    ready = self._notEmpty.wait_for(lambda: self.head is not None, timeout if block else 0)
+                finally:
+                    if writers:
+                        self._version += 1
+                    self._writers = writers
+                if not ready:
+                    raise Empty("pop from an empty list")
+            with self:
+                node = self.head if fromBeginning else self.tail
+                self._unlinkNode(node)
+            return node.key
+
+    def _publishChain(self, iterable):
+        # the old nodes are left untouched for the readers still walking them
+        firstNode, lastNode, count = self._buildChain(iterable)
+        self.head, self.tail = firstNode, lastNode
+
+    def _swapLinkedNodes(self, xNode, yNode):
+        swappedKeys = list()
+        currentNode = self.head
+        while currentNode:
+            if currentNode is xNode:
+                swappedKeys.append(yNode.key)
+            elif currentNode is yNode:
+                swappedKeys.append(xNode.key)
+            else:
+                swappedKeys.append(currentNode.key)
+            currentNode = currentNode.next
+        self._publishChain(swappedKeys)
+
+    def __enter__(self):
+        # holding the list as a context manager makes a group of calls one write;
+        # public methods nest this way too, so only the outermost one bumps the version
+        self._lock.acquire()
+        if self._writers == 0:
+            self._version += 1
+        self._writers += 1
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self._writers -= 1
+        if self._writers == 0:
+            self._version += 1
+            if self.head is not None:
+                self._notEmpty.notify(self._size)
+        self._lock.release()
+
+
+class PooledLinkedList:
+    def __init__(self):
+        self.head = -1
+        self.tail = -1
+        self._size = 0
+        self._keys = list()
+        self._next = array('l')
+        self._prev = array('l')
+        self._free = -1
+
+    def deleteAtBeginning(self):
+        if self.head == -1:
+            return
+        self._unlink(self.head)
+
+    def deleteAtEnd(self):
+        if self.head == -1:
+            return
+        self._unlink(self.tail)
+
+    def deleteAtIndex(self, index):
+        if index not in range(len(self)):
+            raise IndexError("Index must be in range [0, {}].".format(len(self) - 1))
+        self._unlink(self._slotAt(index))
+
+    def deleteKey(self, key):
+        if self.head == -1:
+            return
+        slot = self._findSlot(key)
+        if slot == -1:
+            raise ValueError("'{}' does not exit in the list.".format(key))
+        self._unlink(slot)
+
+    def getIndex(self, key):
+        keys, nextSlots = self._keys, self._next
+        slot = self.head
+        count = 0
+        while slot != -1:
+            if keys[slot] == key:
+                return count
+            slot = nextSlots[slot]
+            count += 1
+        return -1
+
+    def insertAtBeginning(self, key):
+        slot = self._allocate(key, self.head, -1)
+        if self.head == -1:
+            self.tail = slot
+        else:
+            self._prev[self.head] = slot
+        self.head = slot
+        self._size += 1
+
+    def insertAtEnd(self, key):
+        if self.head == -1:
+            self.insertAtBeginning(key)
+            return
+        slot = self._allocate(key, -1, self.tail)
+        self._next[self.tail] = slot
+        self.tail = slot
+        self._size += 1
+
+    def insertAtIndex(self, key, index):
+        if index not in range(len(self) + 1):
+            raise IndexError("Index must be in range [0, {}].".format(len(self)))
+        if index == 0:
+            self.insertAtBeginning(key)
+        elif index == len(self):
+            self.insertAtEnd(key)
+        else:
+            nextSlot = self._slotAt(index)
+            previousSlot = self._prev[nextSlot]
+            slot = self._allocate(key, nextSlot, previousSlot)
+            self._next[previousSlot] = slot
+            self._prev[nextSlot] = slot
+            self._size += 1
+
+    def isEmpty(self):
+        return self.head == -1
+
+    def makeList(self, iterable):
+        for i in iterable:
+            self.insertAtEnd(i)
+
+    def printList(self):
+        keys, nextSlots = self._keys, self._next
+        slot = self.head
+        while slot != -1:
+            if slot == self.head:
+                print(keys[slot], end='')
+            else:
+                print(' -> ', keys[slot], end='')
+            slot = nextSlots[slot]
+        print()
+
+    def updateAtIndex(self, index, key):
+        if index not in range(len(self)):
+            raise IndexError("Index must be in range [0, {}].".format(len(self) - 1))
+        self._keys[self._slotAt(index)] = key
+
+    def updateKey(self, oldKey, newKey):
+        if self.head == -1:
+            return
+        slot = self._findSlot(oldKey)
+        if slot == -1:
+            raise ValueError("'{}' does not exit in the list.".format(oldKey))
+        self._keys[slot] = newKey
+
+    def _allocate(self, key, nextSlot, previousSlot):
+        slot = self._free
+        if slot == -1:
+            slot = len(self._keys)
+            self._keys.append(key)
+            self._next.append(nextSlot)
+            self._prev.append(previousSlot)
+        else:
+            self._free = self._next[slot]
+            self._keys[slot] = key
+            self._next[slot] = nextSlot
+            self._prev[slot] = previousSlot
+        return slot
+
+    def _findSlot(self, key):
+        keys, nextSlots = self._keys, self._next
+        slot = self.head
+        while slot != -1 and keys[slot] != key:
+            slot = nextSlots[slot]
+        return slot
+
+    def _slotAt(self, index):
+        if index <= len(self) // 2:
+            slot = self.head
+            for i in range(index):
+                slot = self._next[slot]
+        else:
+            slot = self.tail
+            for i in range(len(self) - 1 - index):
+                slot = self._prev[slot]
+        return slot
+
+    def _unlink(self, slot):
+        nextSlot, previousSlot = self._next[slot], self._prev[slot]
+        if previousSlot == -1:
+            self.head = nextSlot
+        else:
+            self._next[previousSlot] = nextSlot
+        if nextSlot == -1:
+            self.tail = previousSlot
+        else:
+            self._prev[nextSlot] = previousSlot
+        self._keys[slot] = None  # drop the reference so the key can be collected
+        self._next[slot] = self._free
+        self._free = slot
+        self._size -= 1
+
+    def __iter__(self):
+        keys, nextSlots = self._keys, self._next
+        slot = self.head
+        while slot != -1:
+            yield keys[slot]
+            slot = nextSlots[slot]
+
+    def __len__(self):
+        return self._size
+
+    def __reversed__(self):
+        keys, previousSlots = self._keys, self._prev
+        slot = self.tail
+        while slot != -1:
+            yield keys[slot]
+            slot = previousSlots[slot]
+
+
+class IndexableSkipList:
+    # every link also records its width, the number of level-0 steps it
+    # spans, so positions can be found in O(log n) expected time
+    maxLevels = 32
+
+    def __init__(self):
+        self._head = SkipNode(None, self.maxLevels)
+        self._levels = 1
+        self._size = 0
+
+    def circularLeftShift(self, shift):
+        if len(self) == 0:
+            return
+        shift = shift % len(self)
+        if shift == 0:
+            return
+        # splits every level after position shift and swaps the two parts, so
+        # only the head, the last node before the split and the last node of
+        # each level are relinked: O(log n) expected instead of a rebuild
+        head, size = self._head, len(self)
+        splitNodes, splitPositions = self._findByIndex(shift)
+        lastNodes, lastPositions = self._findByIndex(size)
+        for level in range(self._levels):
+            splitNode, splitPosition = splitNodes[level], splitPositions[level]
+            lastNode, lastPosition = lastNodes[level], lastPositions[level]
+            firstFront, firstFrontPosition = head.next[level], head.width[level]
+            firstBack = splitNode.next[level]
+            if firstBack is not None:
+                head.next[level] = firstBack
+                head.width[level] = splitPosition + splitNode.width[level] - shift
+                if splitNode is head:
+                    lastNode.width[level] = size + 1 - lastPosition + shift
+                else:
+                    lastNode.next[level] = firstFront
+                    lastNode.width[level] = firstFrontPosition + size - lastPosition
+            elif splitNode is not head:
+                head.width[level] = firstFrontPosition + size - shift
+            if splitNode is not head:
+                splitNode.next[level] = None
+                splitNode.width[level] = shift + 1 - splitPosition
+
+    def count(self, key):
+        return sum(1 for k in self if k == key)
+
+    def deleteAtBeginning(self):
+        if len(self) == 0:
+            return
+        self.deleteAtIndex(0)
+
+    def deleteAtEnd(self):
+        if len(self) == 0:
+            return
+        self.deleteAtIndex(len(self) - 1)
+
+    def deleteAtIndex(self, index):
+        if index not in range(len(self)):
+            raise IndexError("Index must be in range [0, {}].".format(len(self) - 1))
+        update, updatePosition = self._findByIndex(index)
+        node = update[0].next[0]
+        for level in range(self._levels):
+            previousNode = update[level]
+            if previousNode.next[level] is node:
+                previousNode.width[level] += node.width[level] - 1
+                previousNode.next[level] = node.next[level]
+            else:
+                previousNode.width[level] -= 1
+        while self._levels > 1 and self._head.next[self._levels - 1] is None:
+            self._levels -= 1
+        self._size -= 1
+
+    def deleteKey(self, key):
+        if len(self) == 0:
+            return
+        index = self.getIndex(key)
+        if index == -1:
+            raise ValueError("'{}' does not exit in the list.".format(key))
+        self.deleteAtIndex(index)
+
+    def getDuplicateList(self):
+        duplicateList = IndexableSkipList()
+        duplicateList.makeList(self)
+        return duplicateList
+
+    def getIndex(self, key):
+        for index, k in enumerate(self):
+            if k == key:
+                return index
+        return -1
+
+    def getMiddleNode(self):
+        if len(self) == 0:
+            return None
+        return self._nodeAt((len(self) - 1) // 2)
+
+    def getReverseList(self):
+        revList = IndexableSkipList()
+        revList.makeList(reversed(self))
+        return revList
+
+    def hasCycle(self):
+        slow = fast = self._head.next[0]
+        while fast and fast.next[0]:
+            slow = slow.next[0]
+            fast = fast.next[0].next[0]
+            if slow is fast:
+                return True
+        return False
+
+    def index(self, key):
+        index = self.getIndex(key)
+        if index == -1:
+            raise ValueError("'{}' does not exit in the list.".format(key))
+        return index
+
+    def insertAtBeginning(self, key):
+        self.insertAtIndex(key, 0)
+
+    def insertAtEnd(self, key):
+        self.insertAtIndex(key, len(self))
+
+    def insertAtIndex(self, key, index):
+        if index not in range(len(self) + 1):
+            raise IndexError("Index must be in range [0, {}].".format(len(self)))
+        update, updatePosition = self._findByIndex(index)
+        self._insertAfter(update, updatePosition, key)
+
+    def isEmpty(self):
+        return len(self) == 0
+
+    def isEqual(self, otherList):
+        if len(self) != len(otherList):
+            return False
+        return all(a == b for a, b in zip(self, otherList))
+
+    def isSorted(self):
+        node = self._head.next[0]
+        while node and node.next[0]:
+            if node.key > node.next[0].key:
+                return False
+            node = node.next[0]
+        return True
+
+    def makeList(self, iterable):
+        # appends in a single pass: the last node seen on every level is kept
+        # as the insertion point, so no search is repeated per key
+        update, updatePosition = self._findByIndex(len(self))
+        for key in iterable:
+            self._insertAfter(update, updatePosition, key)
+
+    def mergeSort(self, key=None, reverse=False):
+        keys = sorted(self, key=key, reverse=reverse)
+        self._clear()
+        self.makeList(keys)
+        return self
+
+    def printList(self):
+        print(*self, sep=' ->  ')
+
+    def rotate(self, k=1):
+        self.circularLeftShift(-k)
+
+    def sortedInsertion(self, key):
+        node = self._head
+        position = 0
+        update = [None] * self.maxLevels
+        updatePosition = [0] * self.maxLevels
+        for level in reversed(range(self._levels)):
+            while node.next[level] is not None and node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+            update[level] = node
+            updatePosition[level] = position
+        self._insertAfter(update, updatePosition, key)
+
+    def swapNodes(self, x, y):
+        if len(self) == 0 or x == y:
+            return
+        xIndex, yIndex = self.getIndex(x), self.getIndex(y)
+        if xIndex == -1:
+            raise ValueError("'{}' does not exit in the list.".format(x))
+        if yIndex == -1:
+            raise ValueError("'{}' does not exit in the list.".format(y))
+        xNode, yNode = self._nodeAt(xIndex), self._nodeAt(yIndex)
+        xNode.key, yNode.key = yNode.key, xNode.key
+
+    def updateAtIndex(self, index, key):
+        if index not in range(len(self)):
+            raise IndexError("Index must be in range [0, {}].".format(len(self) - 1))
+        self._nodeAt(index).key = key
+
+    def updateKey(self, oldKey, newKey):
+        if len(self) == 0:
+            return
+        index = self.getIndex(oldKey)
+        if index == -1:
+            raise ValueError("'{}' does not exit in the list.".format(oldKey))
+        self._nodeAt(index).key = newKey
+
+    def _clear(self):
+        self._head = SkipNode(None, self.maxLevels)
+        self._levels = 1
+        self._size = 0
+
+    def _findByIndex(self, index):
+        # for every level, the last node before position index and its position;
+        # the head sits at position 0 and the key at index at position index + 1
+        node = self._head
+        position = 0
+        update = [None] * self.maxLevels
+        updatePosition = [0] * self.maxLevels
+        for level in reversed(range(self._levels)):
+            while node.next[level] is not None and position + node.width[level] <= index:
+                position += node.width[level]
+                node = node.next[level]
+            update[level] = node
+            updatePosition[level] = position
+        return update, updatePosition
+
+    def _insertAfter(self, update, updatePosition, key):
+        index = updatePosition[0]
+        height = self._randomHeight()
+        if height > self._levels:
+            for level in range(self._levels, height):
+                self._head.width[level] = len(self) + 1
+                update[level] = self._head
+                updatePosition[level] = 0
+            self._levels = height
+        newNode = SkipNode(key, height)
+        for level in range(height):
+            previousNode = update[level]
+            newNode.next[level] = previousNode.next[level]
+            newNode.width[level] = previousNode.width[level] - (index - updatePosition[level])
+            previousNode.next[level] = newNode
+            previousNode.width[level] = index + 1 - updatePosition[level]
+            update[level] = newNode
+            updatePosition[level] = index + 1
+        for level in range(height, self._levels):
+            update[level].width[level] += 1
+        self._size += 1
+
+    def _nodeAt(self, index):
+        node = self._head
+        position = 0
+        for level in reversed(range(self._levels)):
+            while node.next[level] is not None and position + node.width[level] <= index + 1:
+                position += node.width[level]
+                node = node.next[level]
+        return node
+
+    def _randomHeight(self):
+        height = 1
+        while height < self.maxLevels and random() < 0.5:
+            height += 1
+        return height
+
+    def __contains__(self, key):
+        return self.getIndex(key) != -1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return LinkedListView(self, range(*index.indices(len(self))))
+        if index < 0:
+            index += len(self)
+        if index not in range(len(self)):
+            raise IndexError("Index must be in range [0, {}].".format(len(self) - 1))
+        return self._nodeAt(index).key
+
+    def __iter__(self):
+        node = self._head.next[0]
+        while node:
+            yield node.key
+            node = node.next[0]
+
+    def __len__(self):
+        return self._size
+
+    def __reversed__(self):
+        return reversed(list(self))
+
+
+class UnrolledLinkedList:
+    # each node holds up to capacity keys in a Python list, so scans run over
+    # contiguous lists instead of chasing one object per key
+    def __init__(self, capacity=64):
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1.")
+        self.capacity = capacity
+        self.head = None
+        self.tail = None
+        self._size = 0
+
+    def circularLeftShift(self, shift):
+        if self.head is None:
+            return
+        shift = shift % len(self)
+        if shift == 0:
+            return
+        previousChunk, chunk, offset = self._locate(shift)
+        if offset > 0:
+            self._splitChunk(chunk, offset)
+            previousChunk, chunk = chunk, chunk.next
+        oldTail = self.tail
+        oldTail.next = self.head
+        self.head = chunk
+        previousChunk.next = None
+        self.tail = previousChunk
+        # the pieces of the last split now meet in the middle; refilling them
+        # keeps repeated rotations from leaving a trail of tiny chunks
+        if oldTail is not previousChunk:
+            self._refill(oldTail)
+
+    def count(self, key):
+        total = 0
+        chunk = self.head
+        while chunk:
+            total += chunk.keys.count(key)
+            chunk = chunk.next
+        return total
+
+    def deleteAtBeginning(self):
+        if self.head is None:
+            return
+        self._removeAt(None, self.head, 0)
+
+    def deleteAtEnd(self):
+        if self.head is None:
+            return
+        self._removeAt(*self._locate(len(self) - 1))
+
+    def deleteAtIndex(self, index):
+        if index not in range(len(self)):
+            raise IndexError("Index must be in range [0, {}].".format(len(self) - 1))
+        self._removeAt(*self._locate(index))
+
+    def deleteKey(self, key):
+        if self.head is None:
+            return
+        found, previousChunk, chunk, offset = self._findKey(key)
+        if not found:
+            raise ValueError("'{}' does not exit in the list.".format(key))
+        self._removeAt(previousChunk, chunk, offset)
+
+    def getDuplicateList(self):
+        duplicateList = UnrolledLinkedList(self.capacity)
+        chunk = self.head
+        while chunk:
+            duplicateList._appendChunk(ChunkNode(chunk.keys[:]))
+            chunk = chunk.next
+        return duplicateList
+
+    def getIndex(self, key):
+        index = 0
+        chunk = self.head
+        while chunk:
+            if key in chunk.keys:
+                return index + chunk.keys.index(key)
+            index += len(chunk.keys)
+            chunk = chunk.next
+        return -1
+
+    def getMiddleNode(self):
+        if self.head is None:
+            return None
+        # keys are not nodes of their own here, so the middle key is handed
+        # back in a detached node
+        return SinglyNode(self[(len(self) - 1) // 2])
+
+    def getReverseList(self):
+        revList = UnrolledLinkedList(self.capacity)
+        revList.makeList(reversed(self))
+        return revList
+
+    def hasCycle(self):
+        slow = fast = self.head
+        while fast and fast.next:
+            slow = slow.next
+            fast = fast.next.next
+            if slow is fast:
+                return True
+        return False
+
+    def index(self, key):
+        index = self.getIndex(key)
+        if index == -1:
+            raise ValueError("'{}' does not exit in the list.".format(key))
+        return index
+
+    def insertAtBeginning(self, key):
+        self.insertAtIndex(key, 0)
+
+    def insertAtEnd(self, key):
+        if self.tail is None or len(self.tail.keys) >= self.capacity:
+            self._appendChunk(ChunkNode([key]))
+        else:
+            self.tail.keys.append(key)
+            self._size += 1
+
+    def insertAtIndex(self, key, index):
+        if index not in range(len(self) + 1):
+            raise IndexError("Index must be in range [0, {}].".format(len(self)))
+        if index == len(self):
+            self.insertAtEnd(key)
+        else:
+            previousChunk, chunk, offset = self._locate(index)
+            self._insertAt(chunk, offset, key)
+
+    def isEmpty(self):
+        return self.head is None
+
+    def isEqual(self, otherList):
+        if len(self) != len(otherList):
+            return False
+        return not any(map(ne, self, otherList))
+
+    def isSorted(self):
+        previousChunk = None
+        chunk = self.head
+        while chunk:
+            keys = chunk.keys
+            if previousChunk and previousChunk.keys[-1] > keys[0]:
+                return False
+            if any(map(gt, keys, islice(keys, 1, None))):
+                return False
+            previousChunk = chunk
+            chunk = chunk.next
+        return True
+
+    def makeList(self, iterable):
+        keys = list(iterable)
+        start = 0
+        if self.tail is not None:
+            start = self.capacity - len(self.tail.keys)
+            tailKeys = keys[:start]
+            self.tail.keys.extend(tailKeys)
+            self._size += len(tailKeys)
+        for i in range(start, len(keys), self.capacity):
+            self._appendChunk(ChunkNode(keys[i:i + self.capacity]))
+
+    def mergeSort(self, key=None, reverse=False):
+        keys = sorted(self, key=key, reverse=reverse)
+        self.head = self.tail = None
+        self._size = 0
+        self.makeList(keys)
+        return self
+
+    def printList(self):
+        print(*self, sep=' ->  ')
+
+    def rotate(self, k=1):
+        self.circularLeftShift(-k)
+
+    def sortedInsertion(self, key):
+        if self.head is None or self.tail.keys[-1] < key:
+            self.insertAtEnd(key)
+            return
+        chunk = self.head
+        while chunk.keys[-1] < key:
+            chunk = chunk.next
+        self._insertAt(chunk, bisect_left(chunk.keys, key), key)
+
+    def swapNodes(self, x, y):
+        if self.head is None or x == y:
+            return
+        xFound, previousChunk, xChunk, xOffset = self._findKey(x)
+        if not xFound:
+            raise ValueError("'{}' does not exit in the list.".format(x))
+        yFound, previousChunk, yChunk, yOffset = self._findKey(y)
+        if not yFound:
+            raise ValueError("'{}' does not exit in the list.".format(y))
+        xChunk.keys[xOffset], yChunk.keys[yOffset] = y, x
+
+    def updateAtIndex(self, index, key):
+        if index not in range(len(self)):
+            raise IndexError("Index must be in range [0, {}].".format(len(self) - 1))
+        previousChunk, chunk, offset = self._locate(index)
+        chunk.keys[offset] = key
+
+    def updateKey(self, oldKey, newKey):
+        if self.head is None:
+            return
+        found, previousChunk, chunk, offset = self._findKey(oldKey)
+        if not found:
+            raise ValueError("'{}' does not exit in the list.".format(oldKey))
+        chunk.keys[offset] = newKey
+
+    def _appendChunk(self, chunk):
+        if self.tail is None:
+            self.head = chunk
+        else:
+            self.tail.next = chunk
+        self.tail = chunk
+        self._size += len(chunk.keys)
+
+    def _chunkKeys(self):
+        chunk = self.head
+        while chunk:
+            yield chunk.keys
+            chunk = chunk.next
+
+    def _findKey(self, key):
+        previousChunk = None
+        chunk = self.head
+        while chunk:
+            if key in chunk.keys:
+                return True, previousChunk, chunk, chunk.keys.index(key)
+            previousChunk = chunk
+            chunk = chunk.next
+        return False, None, None, -1
+
+    def _insertAt(self, chunk, offset, key):
+        chunk.keys.insert(offset, key)
+        self._size += 1
+        if len(chunk.keys) > self.capacity:
+            self._splitChunk(chunk, len(chunk.keys) // 2)
+
+    def _locate(self, index):
+        previousChunk = None
+        chunk = self.head
+        while index >= len(chunk.keys):
+            index -= len(chunk.keys)
+            previousChunk = chunk
+            chunk = chunk.next
+        return previousChunk, chunk, index
+
+    def _refill(self, chunk):
+        # when chunk or its successor is underfull, merges the two if they fit
+        # and otherwise evens out their keys
+        nextChunk = chunk.next
+        if nextChunk is None or min(len(chunk.keys), len(nextChunk.keys)) >= self.capacity // 2:
+            return
+        if len(chunk.keys) + len(nextChunk.keys) <= self.capacity:
+            chunk.keys.extend(nextChunk.keys)
+            chunk.next = nextChunk.next
+            if nextChunk is self.tail:
+                self.tail = chunk
+        else:
+            moved = (len(nextChunk.keys) - len(chunk.keys)) // 2
+            if moved > 0:
+                chunk.keys.extend(nextChunk.keys[:moved])
+                del nextChunk.keys[:moved]
+            elif moved < 0:
+                nextChunk.keys[:0] = chunk.keys[moved:]
+                del chunk.keys[moved:]
+
+    def _removeAt(self, previousChunk, chunk, offset):
+        del chunk.keys[offset]
+        self._size -= 1
+        nextChunk = chunk.next
+        if not chunk.keys:
+            if previousChunk is None:
+                self.head = nextChunk
+            else:
+                previousChunk.next = nextChunk
+            if chunk is self.tail:
+                self.tail = previousChunk
+        elif len(chunk.keys) < self.capacity // 2:
+            self._refill(chunk)
+
+    def _splitChunk(self, chunk, offset):
+        chunk.next = ChunkNode(chunk.keys[offset:], chunk.next)
+        del chunk.keys[offset:]
+        if chunk is self.tail:
+            self.tail = chunk.next
+
+    def __contains__(self, key):
+        chunk = self.head
+        while chunk:
+            if key in chunk.keys:
+                return True
+            chunk = chunk.next
+        return False
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return LinkedListView(self, range(*index.indices(len(self))))
+        if index < 0:
+            index += len(self)
+        if index not in range(len(self)):
+            raise IndexError("Index must be in range [0, {}].".format(len(self) - 1))
+        previousChunk, chunk, offset = self._locate(index)
+        return chunk.keys[offset]
+
+    def __iter__(self):
+        return chain.from_iterable(self._chunkKeys())
+
+    def __len__(self):
+        return self._size
+
+    def __reversed__(self):
+        chunks = list(self._chunkKeys())
+        return chain.from_iterable(map(reversed, reversed(chunks)))
+
+
+class PersistentList:
+    # an immutable singly linked list. Updates return a new version that
+    # shares every node after the changed position with the old one, so
+    # prepending and popping the front are O(1), a change at index i copies
+    # only the i nodes before it, and a snapshot is the version itself.
+    # Nodes are never written once a version is published, so readers of
+    # any version need no lock and never see a writer's changes.
+    def __init__(self, head=None, size=0):
+        self.head = head
+        self._size = size
+
+    # the read API is shared with SinglyLinkedList, which only reads the nodes
+    count = SinglyLinkedList.count
+    getIndex = SinglyLinkedList.getIndex
+    getMiddleNode = SinglyLinkedList.getMiddleNode
+    index = SinglyLinkedList.index
+    isEmpty = SinglyLinkedList.isEmpty
+    isEqual = SinglyLinkedList.isEqual
+    isSorted = SinglyLinkedList.isSorted
+    printList = SinglyLinkedList.printList
+
+    def deleteAtBeginning(self):
+        if self.head is None:
+            return self
+        return PersistentList(self.head.next, self._size - 1)
+
+    def deleteAtEnd(self):
+        if self.head is None:
+            return self
+        return self.deleteAtIndex(self._size - 1)
+
+    def deleteAtIndex(self, index):
+        if index not in range(len(self)):
+            raise IndexError("Index must be in range [0, {}].".format(len(self) - 1))
+        firstNode, lastNode, currentNode = self._copyPrefix(index)
+        return self._newVersion(firstNode, lastNode, currentNode.next, self._size - 1)
+
+    def deleteKey(self, key):
+        index = self.getIndex(key)
+        if index == -1:
+            raise ValueError("'{}' does not exit in the list.".format(key))
+        return self.deleteAtIndex(index)
+
+    def extend(self, iterable):
+        # the new keys go after a copy of every existing node
+        chainHead, chainTail, count = self._buildChain(iterable)
+        if chainHead is None:
+            return self
+        firstNode, lastNode, currentNode = self._copyPrefix(self._size)
+        return self._newVersion(firstNode, lastNode, chainHead, self._size + count)
+
+    def getReverseList(self):
+        reverseHead = None
+        currentNode = self.head
+        while currentNode:
+            reverseHead = SinglyNode(currentNode.key, reverseHead)
+            currentNode = currentNode.next
+        return PersistentList(reverseHead, self._size)
+
+    def insertAtBeginning(self, key):
+        return PersistentList(SinglyNode(key, self.head), self._size + 1)
+
+    def insertAtEnd(self, key):
+        return self.insertAtIndex(key, self._size)
+
+    def insertAtIndex(self, key, index):
+        if index not in range(len(self) + 1):
+            raise IndexError("Index must be in range [0, {}].".format(len(self)))
+        firstNode, lastNode, currentNode = self._copyPrefix(index)
+        return self._newVersion(firstNode, lastNode, SinglyNode(key, currentNode), self._size + 1)
+
+    def snapshot(self):
+        return self
+
+    def updateAtIndex(self, index, key):
+        if index not in range(len(self)):
+            raise IndexError("Index must be in range [0, {}].".format(len(self) - 1))
+        firstNode, lastNode, currentNode = self._copyPrefix(index)
+        return self._newVersion(firstNode, lastNode, SinglyNode(key, currentNode.next), self._size)
+
+    def updateKey(self, oldKey, newKey):
+        index = self.getIndex(oldKey)
+        if index == -1:
+            raise ValueError("'{}' does not exit in the list.".format(oldKey))
+        return self.updateAtIndex(index, newKey)
+
+    _buildChain = SinglyLinkedList._buildChain
+    _nodeAt = SinglyLinkedList._nodeAt
+
+    def _copyPrefix(self, index):
+        # fresh copies of the first index nodes, and the node at index to share
+        firstNode = lastNode = None
+        currentNode = self.head
+        for i in range(index):
+            newNode = SinglyNode(currentNode.key)
+            if lastNode is None:
+                firstNode = newNode
+            else:
+                lastNode.next = newNode
+            lastNode = newNode
+            currentNode = currentNode.next
+        return firstNode, lastNode, currentNode
+
+    def _newVersion(self, firstNode, lastNode, sharedNode, size):
+        # the copied prefix is not published yet, so its last link can still be set
+        if lastNode is None:
+            return PersistentList(sharedNode, size)
+        lastNode.next = sharedNode
+        return PersistentList(firstNode, size)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        duplicateList = PersistentList().extend(deepcopy(key, memo) for key in self)
+        memo[id(self)] = duplicateList
+        return duplicateList
+
+    __contains__ = SinglyLinkedList.__contains__
+    __getitem__ = SinglyLinkedList.__getitem__
+    __iter__ = SinglyLinkedList.__iter__
+    __len__ = SinglyLinkedList.__len__
+    __reversed__ = SinglyLinkedList.__reversed__
+
+
+class Deque:
+    # a doubly linked deque around a single sentinel node, so every insert
+    # and removal is the same few link writes with no head or tail special
+    # case. Inserting returns the node, which stays a handle for O(1) moves
+    # and removals; nodes are made by nodeClass so callers can keep their
+    # own fields on them, and a removed node can be linked into another deque
+    def __init__(self, nodeClass=DoublyNode):
+        self._nodeClass = nodeClass
+        self._sentinel = DoublyNode()
+        self._sentinel.next = self._sentinel.prev = self._sentinel
+        self._size = 0
+
+    def deleteAtBeginning(self):
+        if self._size:
+            self.removeNode(self._sentinel.next)
+
+    def deleteAtEnd(self):
+        if self._size:
+            self.removeNode(self._sentinel.prev)
+
+    def extend(self, iterable):
+        for key in iterable:
+            self.insertAtEnd(key)
+
+    @property
+    def firstNode(self):
+        node = self._sentinel.next
+        return None if node is self._sentinel else node
+
+    def insertAfter(self, node, key):
+        return self.linkAfter(node, self._nodeClass(key))
+
+    def insertAtBeginning(self, key):
+        return self.linkAfter(self._sentinel, self._nodeClass(key))
+
+    def insertAtEnd(self, key):
+        return self.linkAfter(self._sentinel.prev, self._nodeClass(key))
+
+    def isEmpty(self):
+        return self._size == 0
+
+    @property
+    def lastNode(self):
+        node = self._sentinel.prev
+        return None if node is self._sentinel else node
+
+    def linkAfter(self, previousNode, node):
+        # links a node that is in no deque after previousNode of this one
+        self._linkAfter(previousNode, node)
+        self._size += 1
+        return node
+
+    def linkAtBeginning(self, node):
+        return self.linkAfter(self._sentinel, node)
+
+    def linkAtEnd(self, node):
+        return self.linkAfter(self._sentinel.prev, node)
+
+    def makeList(self, iterable):
+        self.extend(iterable)
+
+    def moveToBeginning(self, node):
+        self._unlink(node)
+        self._linkAfter(self._sentinel, node)
+
+    def moveToEnd(self, node):
+        self._unlink(node)
+        self._linkAfter(self._sentinel.prev, node)
+
+    def popAtBeginning(self):
+        if self._size == 0:
+            raise IndexError("pop from an empty deque")
+        node = self._sentinel.next
+        self.removeNode(node)
+        return node.key
+
+    def popAtEnd(self):
+        if self._size == 0:
+            raise IndexError("pop from an empty deque")
+        node = self._sentinel.prev
+        self.removeNode(node)
+        return node.key
+
+    def printList(self):
+        print(*self, sep=' ->  ')
+
+    def removeNode(self, node):
+        self._unlink(node)
+        self._size -= 1
+
+    def _linkAfter(self, previousNode, node):
+        nextNode = previousNode.next
+        node.prev = previousNode
+        node.next = nextNode
+        previousNode.next = node
+        nextNode.prev = node
+
+    def _unlink(self, node):
+        node.prev.next = node.next
+        node.next.prev = node.prev
+        node.next = node.prev = None
+
+    def __iter__(self):
+        sentinel = self._sentinel
+        currentNode = sentinel.next
+        while currentNode is not sentinel:
+            yield currentNode.key
+            currentNode = currentNode.next
+
+    def __len__(self):
+        return self._size
+
+    def __reversed__(self):
+        sentinel = self._sentinel
+        currentNode = sentinel.prev
+        while currentNode is not sentinel:
+            yield currentNode.key
+            currentNode = currentNode.prev
+
+
+class LinkedListView:
+    # a lazy slice of a linked list: keys are read from the nodes on every
+    # walk, so a view costs no copy but follows later changes to the list
+    def __init__(self, linkedList, indices):
+        self._list = linkedList
+        self._indices = indices
+
+    def __contains__(self, key):
+        return any(k == key for k in self)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return LinkedListView(self._list, self._indices[index])
+        return self._list[self._indices[index]]
+
+    def __iter__(self):
+        start, stop, step = self._indices.start, self._indices.stop, self._indices.step
+        if step > 0:
+            return islice(iter(self._list), start, stop, step)
+        last = len(self._list) - 1
+        return islice(reversed(self._list), last - start, last - stop, -step)
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __reversed__(self):
+        return iter(self[::-1])
+
+
+def _backwardKeys(currentNode):
+    while currentNode:
+        yield currentNode.key
+        currentNode = currentNode.prev
+
+
+def _forwardKeys(currentNode):
+    while currentNode:
+        yield currentNode.key
+        currentNode = currentNode.next
 
 
 def main():
@@ -0,0 +1,218 @@
+#!/usr/bin/env python
+from collections import OrderedDict
+from heapq import heappop, heappush
+
+from SimpleGraph import SimpleGraph
+
+
+class ShortestPaths:
+    # shortest-path queries over a SimpleGraph. Single-source trees are kept in
+    # an LRU cache of cacheSize entries that is dropped as soon as the graph's
+    # version moves, so repeated queries from a few hot sources reuse one search.
+    def __init__(self, graph, cacheSize=128):
+        self._graph = graph
+        self._cacheSize = cacheSize
+        self._cache = OrderedDict()
+        self._cacheVersion = graph.version
+        self._hits = 0
+        self._misses = 0
+        self._reverseAdjacency = None
+
+    def aStar(self, srcName, dstName, heuristic=None):
+        # heuristic(vertexName, dstName) must never overestimate the remaining
+        # distance; without one this is Dijkstra stopped at the target
+        srcObject, dstObject = self._vertex(srcName), self._vertex(dstName)
+        if heuristic is None:
+            heuristic = _zeroHeuristic
+        distances = {srcObject: 0}
+        parents = {srcObject: None}
+        heap = [(heuristic(srcObject.name, dstName), srcObject.id, 0, srcObject)]
+        while heap:
+            estimate, vertexId, distance, vertexObject = heappop(heap)
+            if vertexObject is dstObject:
+                return distance, _pathTo(parents, dstObject)
+            # a stale entry, the vertex was reached more cheaply since it was pushed
+            if distance > distances[vertexObject]:
+                continue
+            for neighbourObject, weight in vertexObject._adjDict.items():
+                _checkWeight(vertexObject, neighbourObject, weight)
+                newDistance = distance + weight
+                if newDistance < distances.get(neighbourObject, float('inf')):
+                    distances[neighbourObject] = newDistance
+                    parents[neighbourObject] = vertexObject
+                    heappush(heap, (newDistance + heuristic(neighbourObject.name, dstName),
+                                    neighbourObject.id, newDistance, neighbourObject))
+        return float('inf'), None
+
+    def bfs(self, srcName):
+        # the unweighted single-source tree: hop counts and parents by name
+        return self._cachedTree('bfs', srcName, self._bfsTree)
+
+    def bidirectionalDijkstra(self, srcName, dstName):
+        # searches forward from the source and backward from the target until
+        # the two frontiers together cannot beat the best meeting point found
+        srcObject, dstObject = self._vertex(srcName), self._vertex(dstName)
+        if srcObject is dstObject:
+            return 0, [srcObject.name]
+        adjacency = (_forwardNeighbours, self._backwardNeighbours())
+        distances = ({srcObject: 0}, {dstObject: 0})
+        parents = ({srcObject: None}, {dstObject: None})
+        heaps = ([(0, srcObject.id, srcObject)], [(0, dstObject.id, dstObject)])
+        settled = (set(), set())
+        best, meeting = float('inf'), None
+        while heaps[0] and heaps[1]:
+            if heaps[0][0][0] + heaps[1][0][0] >= best:
+                break
+            side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            distance, vertexId, vertexObject = heappop(heaps[side])
+            if vertexObject in settled[side]:
+                continue
+            settled[side].add(vertexObject)
+            for neighbourObject, weight in adjacency[side](vertexObject):
+                _checkWeight(vertexObject, neighbourObject, weight)
+                newDistance = distance + weight
+                if newDistance < distances[side].get(neighbourObject, float('inf')):
+                    distances[side][neighbourObject] = newDistance
+                    parents[side][neighbourObject] = vertexObject
+                    heappush(heaps[side], (newDistance, neighbourObject.id, neighbourObject))
+                otherDistance = distances[1 - side].get(neighbourObject)
+                if otherDistance is not None and distances[side][neighbourObject] + otherDistance < best:
+                    best, meeting = distances[side][neighbourObject] + otherDistance, neighbourObject
+        if meeting is None:
+            return float('inf'), None
+        backwardPath = _pathTo(parents[1], meeting)
+        return best, _pathTo(parents[0], meeting) + backwardPath[-2::-1]
+
+    @property
+    def cacheInfo(self):
+        return {'hits': self._hits, 'misses': self._misses,
+                'size': len(self._cache), 'maxSize': self._cacheSize}
+
+    def clearCache(self):
+        self._cache.clear()
+        self._reverseAdjacency = None
+        self._cacheVersion = self._graph.version
+
+    def dijkstra(self, srcName):
+        # the weighted single-source tree: distances and parents by name; the
+        # dictionaries are shared with the cache and must not be modified
+        return self._cachedTree('dijkstra', srcName, self._dijkstraTree)
+
+    def distance(self, srcName, dstName, weighted=True):
+        distances, parents = self.dijkstra(srcName) if weighted else self.bfs(srcName)
+        return distances.get(self._vertex(dstName).name, float('inf'))
+
+    def path(self, srcName, dstName, weighted=True):
+        # the vertex names from source to target, or None if it is unreachable
+        distances, parents = self.dijkstra(srcName) if weighted else self.bfs(srcName)
+        dstName = self._vertex(dstName).name
+        if dstName not in parents:
+            return None
+        path = [dstName]
+        while parents[path[-1]] is not None:
+            path.append(parents[path[-1]])
+        return path[::-1]
+
+    def _backwardNeighbours(self):
+        if not self._graph.directed:
+            return _forwardNeighbours
+        self._checkVersion()
+        if self._reverseAdjacency is None:
+            reverseAdjacency = {vertexObject: list() for vertexName, vertexObject in self._graph.vertexDictionary}
+            for vertexObject in reverseAdjacency:
+                for neighbourObject, weight in vertexObject._adjDict.items():
+                    reverseAdjacency[neighbourObject].append((vertexObject, weight))
+            self._reverseAdjacency = reverseAdjacency
+        return self._reverseAdjacency.__getitem__
+
+    def _bfsTree(self, srcName):
+        distances, parents = dict(), dict()
+        for vertexName, depth, parentName in self._graph.iterBfs(srcName):
+            distances[vertexName] = depth
+            parents[vertexName] = parentName
+        return distances, parents
+
+    def _cachedTree(self, kind, srcName, search):
+        self._checkVersion()
+        key = (kind, self._vertex(srcName).name)
+        tree = self._cache.get(key)
+        if tree is not None:
+            self._hits += 1
+            self._cache.move_to_end(key)
+            return tree
+        self._misses += 1
+        tree = search(key[1])
+        if self._cacheSize > 0:
+            self._cache[key] = tree
+            if len(self._cache) > self._cacheSize:
+                self._cache.popitem(last=False)
+        return tree
+
+    def _checkVersion(self):
+        if self._cacheVersion != self._graph.version:
+            self.clearCache()
+
+    def _dijkstraTree(self, srcName):
+        srcObject = self._vertex(srcName)
+        distances = {srcObject: 0}
+        parents = {srcObject: None}
+        settled = dict()
+        heap = [(0, srcObject.id, srcObject)]
+        while heap:
+            distance, vertexId, vertexObject = heappop(heap)
+            if vertexObject.name in settled:
+                continue
+            settled[vertexObject.name] = distance
+            for neighbourObject, weight in vertexObject._adjDict.items():
+                _checkWeight(vertexObject, neighbourObject, weight)
+                newDistance = distance + weight
+                if newDistance < distances.get(neighbourObject, float('inf')):
+                    distances[neighbourObject] = newDistance
+                    parents[neighbourObject] = vertexObject
+                    heappush(heap, (newDistance, neighbourObject.id, neighbourObject))
+        return settled, {vertexObject.name: None if parentObject is None else parentObject.name
+                         for vertexObject, parentObject in parents.items()}
+
+    def _vertex(self, vertexName):
+        return self._graph._vertexDict[str(vertexName)]
+
+
+def _checkWeight(vertexObject, neighbourObject, weight):
+    if weight < 0:
+        raise ValueError("Negative edge weight {} on ({}, {})".format(
+            weight, vertexObject.name, neighbourObject.name))
+
+
+def _forwardNeighbours(vertexObject):
+    return vertexObject._adjDict.items()
+
+
+def _pathTo(parents, vertexObject):
+    path = list()
+    while vertexObject is not None:
+        path.append(vertexObject.name)
+        vertexObject = parents[vertexObject]
+    return path[::-1]
+
+
+def _zeroHeuristic(vertexName, dstName):
+    return 0
+
+
+def main():
+    edgeList = [('A', 'B', 4), ('A', 'C', 1), ('C', 'B', 2), ('B', 'D', 1),
+                ('C', 'D', 5), ('D', 'E', 3), ('E', 'A', 1)]
+    dg = SimpleGraph(directed=True)
+    dg.fromEdgeList(edgeList)
+    shortestPaths = ShortestPaths(dg)
+    print("The shortest distances from 'A' are:")
+    print(shortestPaths.dijkstra('A')[0])
+    print("\nThe shortest path from 'A' to 'E' is:")
+    print(shortestPaths.path('A', 'E'), shortestPaths.distance('A', 'E'))
+    print(shortestPaths.bidirectionalDijkstra('A', 'E'))
+    print(shortestPaths.aStar('A', 'E'))
+    print("\nThe fewest hops from 'A' to 'E' are:", shortestPaths.distance('A', 'E', weighted=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,21 @@
 #!/usr/bin/env python
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress, islice
+from multiprocessing import shared_memory
 
 
 class Vertex:
-    def __init__(self, vertexName):
+    def __init__(self, vertexName, vertexId=0):
         self.name = str(vertexName)
+        # a dense integer id, so traversals can mark vertices in a bytearray
+        self.id = vertexId
         self._adjDict = dict()
         self._adjSet = set()
 
@@ -40,95 +52,183 @@ class Vertex:
         print("{}: ".format(self.name), end='')
         print([(vobj.name, wt) for vobj, wt in self.adjacencyDictionary])
 
+    def removeNeighbour(self, vertexObject):
+        del self._adjDict[vertexObject]
+        self._adjSet.discard(vertexObject)
+
+
+# one entry of the SimpleGraph change log: action is one of addVertex,
+# removeVertex, addEdge, updateEdge and removeEdge, with vname and weight
+# left as None where they do not apply
+GraphChange = namedtuple('GraphChange', 'version action uname vname weight')
+
 
 class SimpleGraph:
-    def __init__(self, directed=False):
+    def __init__(self, directed=False, changeLogSize=1 << 16):
         self._directed = directed
         self._vertexDict = dict()
         self._vertexSet = set()
+        # a union-find forest over vertex ids, updated as vertices and edges
+        # are added; edge direction is ignored, so directed graphs get their
+        # weakly connected components. Removals cannot be undone in a
+        # union-find, so they mark it stale and it is rebuilt on the next query.
+        self._vertexNames = list()
+        self._componentParent = list()
+        self._componentRank = bytearray()
+        self._componentCount = 0
+        self._componentsStale = False
+        # bumped by every mutation, so derived results can be cached against
+        # it; the log keeps the latest changeLogSize changes, one per version
+        self._version = 0
+        self._changeLog = deque(maxlen=changeLogSize)
 
     def addEdge(self, edge):
-        if not isinstance(edge, tuple):
-            print("An edge must a tuple: ", edge)
-            exit(1)
-        if len(edge) == 2 and not self._directed:
+        return self._addEdge(*self._parseEdge(edge))
+
+    def addEdges(self, edges):
+        # every edge is validated before the graph changes; repeated edges are
+        # added once with the last weight given. Returns how many edges were new.
+        directed = self._directed
+        edgeSize = 3 if directed else 2
+        parsedEdges = dict()
+        for edge in edges:
+            if not isinstance(edge, tuple) or len(edge) != edgeSize:
+                self._parseEdge(edge)
             uname, vname = str(edge[0]), str(edge[1])
-            wt = 0
-        elif len(edge) == 3 and self._directed:
-            uname, vname, wt = str(t[0]), str(t[1]), float(t[2])
-        else:
-            print("An edge must a tuple of length 2 (undirected) or 3 (directed): ", edge)
-            exit(1)
-        uobj = self.addVertex(uname)
-        vobj = self.addVertex(vname)
-        uobj.addNeighbour(vobj, wt)
-        if not self._directed:
-            vobj.addNeighbour(uobj, wt)
+            key = (uname, vname) if directed or uname <= vname else (vname, uname)
+            parsedEdges[key] = (uname, vname, float(edge[2]) if directed else 0)
+        vertexDict = self._vertexDict
+        added = 0
+        for uname, vname, wt in parsedEdges.values():
+            uobj = vertexDict.get(uname) or self.addVertex(uname)
+            vobj = vertexDict.get(vname) or self.addVertex(vname)
+            added += self._linkVertices(uobj, vobj, wt)
+        return added
 
     def addVertex(self, vertexName):
         vertexName = str(vertexName)
         if vertexName in self._vertexSet:
             vertexObject = self._vertexDict[vertexName]
         else:
-            vertexObject = Vertex(vertexName)
+            vertexObject = Vertex(vertexName, len(self._vertexDict))
             self._vertexDict[vertexName] = vertexObject
             self._vertexSet.add(vertexName)
+            self._vertexNames.append(vertexName)
+            self._componentParent.append(vertexObject.id)
+            self._componentRank.append(0)
+            self._componentCount += 1
+            self._recordChange('addVertex', vertexName)
         return vertexObject
 
     def bfs(self, srcName):
-        visited = set()
-        visitSeq = list()
-        queue = list()
-        queue.append(self._vertexDict[srcName])
-        while queue:
-            vertexObject = queue.pop(0)
-            if vertexObject.name not in visited:
-                visited.add(vertexObject.name)
-                visitSeq.append(vertexObject.name)
-                queue.extend(list(vertexObject.adjacencySet - visited))
-        return visitSeq, visited
+        visitSeq = [vertexName for vertexName, depth, parentName in self.iterBfs(srcName)]
+        return visitSeq, set(visitSeq)
+
+    def changesSince(self, version):
+        # the changes made after version, oldest first, or None when the log
+        # no longer reaches back that far and the consumer has to rebuild
+        if version >= self._version:
+            return list()
+        if not self._changeLog or self._changeLog[0][0] > version + 1:
+            return None
+        return [GraphChange._make(change) for change in
+                islice(self._changeLog, version + 1 - self._changeLog[0][0], None)]
+
+    def componentOf(self, vertexName):
+        # the representative vertex of the component; it can change as components merge
+        self._refreshComponents()
+        return self._vertexNames[self._findComponent(self._vertexDict[vertexName].id)]
 
     @property
     def connectedComponents(self):
-        components = list()
-        visited = set()
-        unvisited = (
-            vertexName for vertexName in self.vertexSet if vertexName not in visited)
-        for vertexName in unvisited:
-            visitSeq, component = self.dfs(vertexName)
-            visited |= component
-            components.append(component)
-        return components
+        self._refreshComponents()
+        components = dict()
+        for vertexId, vertexName in enumerate(self._vertexNames):
+            components.setdefault(self._findComponent(vertexId), set()).add(vertexName)
+        return list(components.values())
 
     def dfs(self, srcName):
-        visited = set()
-        visitSeq = list()
-        stack = list()
-        stack.append(self._vertexDict[srcName])
-        while stack:
-            vertexObject = stack.pop()
-            if vertexObject.name not in visited:
-                visited.add(vertexObject.name)
-                visitSeq.append(vertexObject.name)
-                stack.extend(list(vertexObject.adjacencySet - visited))
-        return visitSeq, visited
+        visitSeq = [vertexName for vertexName, depth, parentName in self.iterDfs(srcName)]
+        return visitSeq, set(visitSeq)
+
+    def findCycle(self):
+        # a directed cycle as vertex names with the first repeated at the end,
+        # or None for a DAG; an iterative DFS colours vertices white, grey
+        # (on the current path) and black, and a grey neighbour closes a cycle
+        adjacency = self._directedAdjacency()
+        colours = bytearray(len(adjacency))
+        for root in range(len(adjacency)):
+            if colours[root]:
+                continue
+            colours[root] = 1
+            path, positions = [root], [0]
+            while path:
+                vertexId, position = path[-1], positions[-1]
+                if position == len(adjacency[vertexId]):
+                    colours[vertexId] = 2
+                    path.pop()
+                    positions.pop()
+                    continue
+                positions[-1] = position + 1
+                neighbourId = adjacency[vertexId][position]
+                if colours[neighbourId] == 1:
+                    cycle = path[path.index(neighbourId):] + [neighbourId]
+                    return [self._vertexNames[cycleId] for cycleId in cycle]
+                if not colours[neighbourId]:
+                    colours[neighbourId] = 1
+                    path.append(neighbourId)
+                    positions.append(0)
+        return None
 
     def fromEdgeList(self, edgeList):
-        for edge in edgeList:
-            edge = tuple(edge)
-            self.addEdge(edge)
-
-    def fromFile(self, filename):
-        with open(filename, 'r') as f:
-            for line in f.readlines():
-                line = str(line.strip('\r').strip('\n'))
-                if self.directed:
-                    u, v, wt = line.split()
-                    edge = (u, v, wt)
-                else:
-                    u, v = line.split()
-                    edge = (u, v)
-                self.addEdge(edge)
+        self.addEdges(tuple(edge) for edge in edgeList)
+
+    @property
+    def directed(self):
+        return self._directed
+
+    def fromBinaryFile(self, filename):
+        csrGraph = CSRGraph.load(filename)
+        if csrGraph.directed != self._directed:
+            raise ValueError("{} does not hold a {} graph".format(
+                filename, "directed" if self._directed else "undirected"))
+        vertexObjects = [self.addVertex(name) for name in csrGraph._names]
+        offsets, neighbours, weights = csrGraph._offsets, csrGraph._neighbours, csrGraph._weights
+        for vertexId, uobj in enumerate(vertexObjects):
+            for i in range(offsets[vertexId], offsets[vertexId + 1]):
+                vobj, wt = vertexObjects[neighbours[i]], 0 if weights is None else weights[i]
+                # rows are added as stored to keep the neighbour order; an
+                # undirected edge is in two rows and is recorded from the first
+                if self._directed or neighbours[i] >= vertexId:
+                    isNew = vobj not in uobj._adjDict
+                    if isNew or uobj._adjDict[vobj] != wt:
+                        self._edgeLinked(uobj, vobj, wt, isNew)
+                uobj.addNeighbour(vobj, wt)
+
+    def fromFile(self, filename, workers=1):
+        # as with edge tuples, directed graphs need a weight on every line and undirected ones none
+        for uname, vname, wt in iterEdgeFile(filename, workers, weighted=self._directed):
+            self._addEdge(uname, vname, wt)
+
+    def hasCycle(self):
+        return self.findCycle() is not None
+
+    def iterBfs(self, srcName):
+        # yields (name, depth, parent name) lazily; the source has parent None
+        return self._iterBfs(self._vertexDict[srcName], bytearray(len(self._vertexDict)))
+
+    def iterDfs(self, srcName):
+        # yields (name, depth, parent name) in preorder, exploring neighbours
+        # in insertion order; the source has parent None
+        return self._iterDfs(self._vertexDict[srcName], bytearray(len(self._vertexDict)))
+
+    def multiSourceBfs(self, sources, workers=1):
+        return self.toCSR().multiSourceBfs(sources, workers)
+
+    @property
+    def numberOfComponents(self):
+        self._refreshComponents()
+        return self._componentCount
 
     @property
     def printGraph(self):
@@ -148,6 +248,125 @@ class SimpleGraph:
     def printAdjacencyDictionary(self, vertexName):
         self._vertexDict[vertexName].printAdjacencyDictionary
 
+    def removeEdge(self, edge):
+        self._unlinkVertices(*self._edgeVertices(*self._parseEdgeEnds(edge)))
+
+    def removeEdges(self, edges):
+        # every edge is checked before any is removed, so a missing edge
+        # raises KeyError with the graph unchanged. Returns how many were removed.
+        edgeVertices = dict()
+        for edge in edges:
+            uname, vname = self._parseEdgeEnds(edge)
+            edgeVertices[self._edgeKey(uname, vname)] = self._edgeVertices(uname, vname)
+        for uobj, vobj in edgeVertices.values():
+            self._unlinkVertices(uobj, vobj)
+        return len(edgeVertices)
+
+    def removeVertex(self, vertexName):
+        vertexName = str(vertexName)
+        vertexObject = self._vertexDict[vertexName]
+        for neighbourObject in list(vertexObject._adjDict):
+            self._unlinkVertices(vertexObject, neighbourObject)
+        if self._directed:
+            # only out-edges are stored, so the edges into the vertex need a scan
+            for uobj in self._vertexDict.values():
+                if vertexObject in uobj._adjDict:
+                    self._unlinkVertices(uobj, vertexObject)
+        # the last vertex takes over the id, which keeps ids dense
+        lastObject = self._vertexDict[self._vertexNames[-1]]
+        lastObject.id = vertexObject.id
+        self._vertexNames[lastObject.id] = lastObject.name
+        self._vertexNames.pop()
+        del self._vertexDict[vertexName]
+        self._vertexSet.discard(vertexName)
+        self._componentsStale = True
+        self._recordChange('removeVertex', vertexName)
+
+    def sameComponent(self, uname, vname):
+        self._refreshComponents()
+        return (self._findComponent(self._vertexDict[uname].id) ==
+                self._findComponent(self._vertexDict[vname].id))
+
+    def save(self, filename):
+        self.toCSR().save(filename)
+
+    @property
+    def stronglyConnectedComponents(self):
+        # Tarjan's algorithm with an explicit call stack, so deep graphs cannot
+        # hit the recursion limit; components come out in reverse topological
+        # order of the condensation
+        adjacency = self._directedAdjacency()
+        vertexCount = len(adjacency)
+        order, lowLink = [-1] * vertexCount, [0] * vertexCount
+        onStack = bytearray(vertexCount)
+        stack, components = list(), list()
+        counter = 0
+        for root in range(vertexCount):
+            if order[root] >= 0:
+                continue
+            order[root] = lowLink[root] = counter
+            counter += 1
+            stack.append(root)
+            onStack[root] = 1
+            callStack, positions = [root], [0]
+            while callStack:
+                vertexId, position = callStack[-1], positions[-1]
+                if position < len(adjacency[vertexId]):
+                    positions[-1] = position + 1
+                    neighbourId = adjacency[vertexId][position]
+                    if order[neighbourId] < 0:
+                        order[neighbourId] = lowLink[neighbourId] = counter
+                        counter += 1
+                        stack.append(neighbourId)
+                        onStack[neighbourId] = 1
+                        callStack.append(neighbourId)
+                        positions.append(0)
+                    elif onStack[neighbourId] and order[neighbourId] < lowLink[vertexId]:
+                        lowLink[vertexId] = order[neighbourId]
+                    continue
+                callStack.pop()
+                positions.pop()
+                if callStack and lowLink[vertexId] < lowLink[callStack[-1]]:
+                    lowLink[callStack[-1]] = lowLink[vertexId]
+                if lowLink[vertexId] == order[vertexId]:
+                    component = set()
+                    while True:
+                        memberId = stack.pop()
+                        onStack[memberId] = 0
+                        component.add(self._vertexNames[memberId])
+                        if memberId == vertexId:
+                            break
+                    components.append(component)
+        return components
+
+    def toCSR(self):
+        return CSRGraph.fromGraph(self)
+
+    def topologicalSort(self):
+        # Kahn's algorithm: repeatedly emit a vertex with no remaining in-edges,
+        # taking ready vertices in id order; a cycle raises ValueError with a witness
+        adjacency = self._directedAdjacency()
+        inDegrees = [0] * len(adjacency)
+        for neighbourIds in adjacency:
+            for neighbourId in neighbourIds:
+                inDegrees[neighbourId] += 1
+        ready = deque(vertexId for vertexId, inDegree in enumerate(inDegrees) if inDegree == 0)
+        order = list()
+        while ready:
+            vertexId = ready.popleft()
+            order.append(self._vertexNames[vertexId])
+            for neighbourId in adjacency[vertexId]:
+                inDegrees[neighbourId] -= 1
+                if inDegrees[neighbourId] == 0:
+                    ready.append(neighbourId)
+        if len(order) < len(adjacency):
+            raise ValueError("The graph has a cycle: {}".format(" -> ".join(self.findCycle())))
+        return order
+
+    @property
+    def version(self):
+        return self._version
+
     @property
     def vertexDictionary(self):
         return list(self._vertexDict.items())
@@ -160,6 +379,634 @@ class SimpleGraph:
     def vertexSet(self):
         return self._vertexSet
 
+    def _addEdge(self, uname, vname, wt):
+        # names are already strings here, which lets bulk loaders skip the checks in addEdge
+        uobj = self._vertexDict.get(uname) or self.addVertex(uname)
+        vobj = self._vertexDict.get(vname) or self.addVertex(vname)
+        return self._linkVertices(uobj, vobj, wt)
+
+    def _directedAdjacency(self):
+        # neighbour ids per vertex id, so the directed algorithms work on plain lists
+        if not self._directed:
+            raise ValueError("This operation needs a directed graph")
+        adjacency = [None] * len(self._vertexNames)
+        for vertexObject in self._vertexDict.values():
+            adjacency[vertexObject.id] = [neighbourObject.id for neighbourObject in vertexObject._adjDict]
+        return adjacency
+
+    def _edgeKey(self, uname, vname):
+        if self._directed or uname <= vname:
+            return uname, vname
+        return vname, uname
+
+    def _edgeLinked(self, uobj, vobj, wt, isNew):
+        if isNew and not self._componentsStale:
+            self._unionComponents(uobj.id, vobj.id)
+        self._recordChange('addEdge' if isNew else 'updateEdge', uobj.name, vobj.name, wt)
+
+    def _edgeVertices(self, uname, vname):
+        uobj, vobj = self._vertexDict.get(uname), self._vertexDict.get(vname)
+        if uobj is None or vobj is None or vobj not in uobj._adjDict:
+            raise KeyError((uname, vname))
+        return uobj, vobj
+
+    def _findComponent(self, vertexId):
+        parent = self._componentParent
+        root = vertexId
+        while parent[root] != root:
+            root = parent[root]
+        # path compression: everything on the way now points at the root
+        while parent[vertexId] != root:
+            parent[vertexId], vertexId = root, parent[vertexId]
+        return root
+
+    def _iterBfs(self, srcObject, visited):
+        visited[srcObject.id] = 1
+        yield srcObject.name, 0, None
+        queue = deque([(srcObject, 0)])
+        while queue:
+            vertexObject, depth = queue.popleft()
+            for neighbourObject in vertexObject._adjDict:
+                if not visited[neighbourObject.id]:
+                    visited[neighbourObject.id] = 1
+                    yield neighbourObject.name, depth + 1, vertexObject.name
+                    queue.append((neighbourObject, depth + 1))
+
+    def _iterDfs(self, srcObject, visited):
+        visited[srcObject.id] = 1
+        yield srcObject.name, 0, None
+        # each stack entry keeps its own neighbour iterator, so a vertex's
+        # adjacency is scanned once however deep the search goes
+        stack = [(srcObject, iter(srcObject._adjDict))]
+        while stack:
+            vertexObject, neighbours = stack[-1]
+            for neighbourObject in neighbours:
+                if not visited[neighbourObject.id]:
+                    visited[neighbourObject.id] = 1
+                    yield neighbourObject.name, len(stack), vertexObject.name
+                    stack.append((neighbourObject, iter(neighbourObject._adjDict)))
+                    break
+            else:
+                stack.pop()
+
+    def _linkVertices(self, uobj, vobj, wt):
+        # returns whether the edge is new; re-adding it with the same weight changes nothing
+        isNew = vobj not in uobj._adjDict
+        if not isNew and uobj._adjDict[vobj] == wt:
+            return False
+        uobj.addNeighbour(vobj, wt)
+        if not self._directed:
+            vobj.addNeighbour(uobj, wt)
+        self._edgeLinked(uobj, vobj, wt, isNew)
+        return isNew
+
+    def _parseEdge(self, edge):
+        if not isinstance(edge, tuple):
+            raise TypeError("An edge must be a tuple: {}".format(edge))
+        if len(edge) == 2 and not self._directed:
+            return str(edge[0]), str(edge[1]), 0
+        if len(edge) == 3 and self._directed:
+            return str(edge[0]), str(edge[1]), float(edge[2])
+        raise ValueError("An edge must be a tuple of length 2 (undirected) or 3 (directed): {}".format(edge))
+
+    def _parseEdgeEnds(self, edge):
+        # removals accept (u, v) for any graph and (u, v, weight) for directed ones
+        if not isinstance(edge, tuple):
+            raise TypeError("An edge must be a tuple: {}".format(edge))
+        if len(edge) == 2 or (len(edge) == 3 and self._directed):
+            return str(edge[0]), str(edge[1])
+        raise ValueError("An edge must be a tuple of length 2 (undirected) or 3 (directed): {}".format(edge))
+
+    def _recordChange(self, action, uname, vname=None, weight=None):
+        # plain tuples are logged, they only become GraphChange when read
+        self._version += 1
+        self._changeLog.append((self._version, action, uname, vname, weight))
+
+    def _refreshComponents(self):
+        if not self._componentsStale:
+            return
+        vertexCount = len(self._vertexNames)
+        self._componentParent = list(range(vertexCount))
+        self._componentRank = bytearray(vertexCount)
+        self._componentCount = vertexCount
+        self._componentsStale = False
+        for uobj in self._vertexDict.values():
+            for vobj in uobj._adjDict:
+                self._unionComponents(uobj.id, vobj.id)
+
+    def _unionComponents(self, uid, vid):
+        uroot, vroot = self._findComponent(uid), self._findComponent(vid)
+        if uroot == vroot:
+            return
+        rank = self._componentRank
+        if rank[uroot] < rank[vroot]:
+            uroot, vroot = vroot, uroot
+        self._componentParent[vroot] = uroot
+        if rank[uroot] == rank[vroot]:
+            rank[uroot] += 1
+        self._componentCount -= 1
+
+    def _unlinkVertices(self, uobj, vobj):
+        uobj.removeNeighbour(vobj)
+        if not self._directed and vobj is not uobj:
+            vobj.removeNeighbour(uobj)
+        self._componentsStale = True
+        self._recordChange('removeEdge', uobj.name, vobj.name)
+
+
+class CSRGraph:
+    # a frozen graph in compressed sparse row form: vertex names map to ids
+    # 0..n-1 and the neighbours of id v are neighbours[offsets[v]:offsets[v + 1]]
+    binaryMagic = b'CSRGRAPH'
+    binaryVersion = 1
+    # magic, version, flags, vertex count, neighbour count, name table bytes
+    _header = struct.Struct('<8sIIQQQ')
+    _directedFlag = 1
+    _weightedFlag = 2
+
+    def __init__(self, names, offsets, neighbours, weights=None, directed=False, ids=None):
+        self._directed = directed
+        self._names = names
+        self._ids = ids if ids is not None else {name: vertexId for vertexId, name in enumerate(names)}
+        self._offsets = offsets
+        self._neighbours = neighbours
+        self._weights = weights
+
+    def bfs(self, srcName):
+        visitOrder = self._bfsIds(self._ids[srcName], bytearray(self.numberOfVertices))
+        visitSeq = [self._names[vertexId] for vertexId in visitOrder]
+        return visitSeq, set(visitSeq)
+
+    @property
+    def connectedComponents(self):
+        if self._directed:
+            return self._weakComponents()
+        components = list()
+        visited = bytearray(self.numberOfVertices)
+        for vertexId in range(self.numberOfVertices):
+            if not visited[vertexId]:
+                component = self._bfsIds(vertexId, visited)
+                components.append({self._names[memberId] for memberId in component})
+        return components
+
+    def degree(self, vertexName):
+        vertexId = self._ids[vertexName]
+        return self._offsets[vertexId + 1] - self._offsets[vertexId]
+
+    def dfs(self, srcName):
+        visitOrder = self._dfsIds(self._ids[srcName], bytearray(self.numberOfVertices))
+        visitSeq = [self._names[vertexId] for vertexId in visitOrder]
+        return visitSeq, set(visitSeq)
+
+    @property
+    def directed(self):
+        return self._directed
+
+    @classmethod
+    def fromEdgeList(cls, edgeList, directed=False):
+        builder = _CSRBuilder(directed)
+        for edge in edgeList:
+            builder.addEdge(*edge)
+        return builder.build()
+
+    @classmethod
+    def fromFile(cls, filename, directed=False, workers=1):
+        builder = _CSRBuilder(directed)
+        for uname, vname, weight in iterEdgeFile(filename, workers):
+            builder.addEdge(uname, vname, weight)
+        return builder.build()
+
+    @classmethod
+    def fromGraph(cls, graph):
+        names = list(graph._vertexDict)
+        ids = {name: vertexId for vertexId, name in enumerate(names)}
+        offsets = array('q', [0])
+        neighbours = array('i')
+        weights = array('d')
+        for name in names:
+            for vertexObject, weight in graph._vertexDict[name]._adjDict.items():
+                neighbours.append(ids[vertexObject.name])
+                weights.append(weight)
+            offsets.append(len(neighbours))
+        if not any(weights):
+            weights = None
+        return cls(names, offsets, neighbours, weights, graph._directed)
+
+    @classmethod
+    def load(cls, filename):
+        # the arrays are typed views straight into a read-only shared mapping,
+        # so opening is O(1) in the graph size, pages are read on first touch
+        # and processes loading the same file share them
+        if sys.byteorder != 'little':
+            raise ValueError("Binary graph files can only be mapped on little-endian hosts")
+        with open(filename, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(buffer) < cls._header.size:
+            raise ValueError("{} is not a binary graph file".format(filename))
+        magic, version, flags, vertexCount, neighbourCount, nameBytes = cls._header.unpack_from(buffer)
+        if magic != cls.binaryMagic:
+            raise ValueError("{} is not a binary graph file".format(filename))
+        if version != cls.binaryVersion:
+            raise ValueError("{} uses binary format version {}, expected {}".format(
+                filename, version, cls.binaryVersion))
+        view = memoryview(buffer)
+        sections = list()
+        position = cls._header.size
+        for typecode, count in (('q', vertexCount + 1), ('i', vertexCount), ('q', vertexCount + 1),
+                                ('i', neighbourCount), ('d', neighbourCount if flags & cls._weightedFlag else 0),
+                                ('B', nameBytes)):
+            end = position + count * array(typecode).itemsize
+            if end > len(buffer):
+                raise ValueError("{} is truncated".format(filename))
+            sections.append(view[position:end].cast(typecode))
+            position = _align(end)
+        nameOffsets, nameOrder, offsets, neighbours, weights, nameTable = sections
+        names = _MappedNames(nameTable, nameOffsets)
+        return cls(names, offsets, neighbours, weights if flags & cls._weightedFlag else None,
+                   bool(flags & cls._directedFlag), _MappedNameIds(names, nameOrder))
+
+    def getWeight(self, uname, vname):
+        uid, vid = self._ids[uname], self._ids[vname]
+        for i in range(self._offsets[uid], self._offsets[uid + 1]):
+            if self._neighbours[i] == vid:
+                return 0 if self._weights is None else self._weights[i]
+        raise KeyError((uname, vname))
+
+    def multiSourceBfs(self, sources, workers=1):
+        # hop distances from every source as {source: {name: distance}}, with
+        # unreachable vertices left out. With several workers, the offsets and
+        # neighbours are copied once into shared memory and the sources are
+        # split into batches for a process pool, so each process only maps the
+        # adjacency instead of receiving its own copy.
+        sourceIds = [self._ids[srcName] for srcName in sources]
+        vertexCount = self.numberOfVertices
+        if workers <= 1 or len(sourceIds) <= 1:
+            rows = [_bfsDistances(self._offsets, self._neighbours, vertexCount, srcId).tobytes()
+                    for srcId in sourceIds]
+        else:
+            rows = self._parallelBfsDistances(sourceIds, workers)
+        distances = dict()
+        for srcName, row in zip(sources, rows):
+            row = array('i', row)
+            distances[srcName] = dict(compress(zip(self._names, row), map((-1).__ne__, row)))
+        return distances
+
+    def neighbours(self, vertexName):
+        vertexId = self._ids[vertexName]
+        return [self._names[neighbourId] for neighbourId in
+                self._neighbours[self._offsets[vertexId]:self._offsets[vertexId + 1]]]
+
+    @property
+    def numberOfEdges(self):
+        # an undirected edge is stored once in each direction
+        if self._directed:
+            return len(self._neighbours)
+        loops = sum(1 for vertexId in range(self.numberOfVertices)
+                    if vertexId in self._neighbours[self._offsets[vertexId]:self._offsets[vertexId + 1]])
+        return (len(self._neighbours) + loops) // 2
+
+    @property
+    def numberOfVertices(self):
+        return len(self._names)
+
+    def save(self, filename):
+        # sections follow the header in this order, each 8-byte aligned: name
+        # offsets, vertex ids sorted by name (for lookups without a dict), CSR
+        # offsets, neighbour ids, weights (only if weighted), utf-8 names
+        encodedNames = [str(name).encode() for name in self._names]
+        nameOffsets = array('q', [0])
+        for encodedName in encodedNames:
+            nameOffsets.append(nameOffsets[-1] + len(encodedName))
+        nameOrder = array('i', sorted(range(len(encodedNames)), key=encodedNames.__getitem__))
+        flags = self._directedFlag if self._directed else 0
+        sections = [nameOffsets, nameOrder, _asArray('q', self._offsets), _asArray('i', self._neighbours)]
+        if self._weights is not None:
+            flags |= self._weightedFlag
+            sections.append(_asArray('d', self._weights))
+        sections.append(b''.join(encodedNames))
+        with open(filename, 'wb') as f:
+            f.write(self._header.pack(self.binaryMagic, self.binaryVersion, flags,
+                                      len(encodedNames), len(self._neighbours), nameOffsets[-1]))
+            for section in sections:
+                f.write(section)
+                f.write(bytes(_align(f.tell()) - f.tell()))
+
+    @property
+    def version(self):
+        # a CSRGraph never changes, so anything cached against it stays valid
+        return 0
+
+    @property
+    def vertexList(self):
+        return list(self._names)
+
+    @property
+    def vertexSet(self):
+        return set(self._names)
+
+    def _bfsIds(self, srcId, visited):
+        offsets, neighbours = self._offsets, self._neighbours
+        visited[srcId] = 1
+        visitOrder = [srcId]
+        # the list doubles as the queue: iterating it also visits the ids appended meanwhile
+        for vertexId in visitOrder:
+            for neighbourId in neighbours[offsets[vertexId]:offsets[vertexId + 1]]:
+                if not visited[neighbourId]:
+                    visited[neighbourId] = 1
+                    visitOrder.append(neighbourId)
+        return visitOrder
+
+    def _dfsIds(self, srcId, visited):
+        offsets, neighbours = self._offsets, self._neighbours
+        visited[srcId] = 1
+        visitOrder = [srcId]
+        stack = [srcId]
+        positions = [offsets[srcId]]
+        while stack:
+            vertexId = stack[-1]
+            position, end = positions[-1], offsets[vertexId + 1]
+            while position < end and visited[neighbours[position]]:
+                position += 1
+            if position == end:
+                stack.pop()
+                positions.pop()
+                continue
+            positions[-1] = position + 1
+            neighbourId = neighbours[position]
+            visited[neighbourId] = 1
+            visitOrder.append(neighbourId)
+            stack.append(neighbourId)
+            positions.append(offsets[neighbourId])
+        return visitOrder
+
+    def _parallelBfsDistances(self, sourceIds, workers):
+        blocks = list()
+        try:
+            for section in (self._offsets, self._neighbours):
+                data = memoryview(section).cast('B')
+                block = shared_memory.SharedMemory(create=True, size=max(1, len(data)))
+                blocks.append(block)
+                block.buf[:len(data)] = data
+            # a few batches per worker evens out sources with very different reach
+            batchSize = -(-len(sourceIds) // (4 * workers))
+            batches = [sourceIds[i:i + batchSize] for i in range(0, len(sourceIds), batchSize)]
+            with ProcessPoolExecutor(workers, initializer=_attachSharedGraph,
+                                     initargs=(blocks[0].name, blocks[1].name,
+                                               self.numberOfVertices, len(self._neighbours))) as executor:
+                return [row for rows in executor.map(_sharedBfsBatch, batches) for row in rows]
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    def _weakComponents(self):
+        parent = list(range(self.numberOfVertices))
+
+        def find(vertexId):
+            while parent[vertexId] != vertexId:
+                parent[vertexId] = parent[parent[vertexId]]
+                vertexId = parent[vertexId]
+            return vertexId
+
+        for vertexId in range(self.numberOfVertices):
+            for neighbourId in self._neighbours[self._offsets[vertexId]:self._offsets[vertexId + 1]]:
+                parent[find(neighbourId)] = find(vertexId)
+        components = dict()
+        for vertexId, name in enumerate(self._names):
+            components.setdefault(find(vertexId), set()).add(name)
+        return list(components.values())
+
+
+class _CSRBuilder:
+    def __init__(self, directed):
+        self._directed = directed
+        self._names = list()
+        self._ids = dict()
+        self._sources = array('i')
+        self._targets = array('i')
+        self._weights = array('d')
+
+    def addEdge(self, uname, vname, weight=0):
+        uid, vid = self._idOf(str(uname)), self._idOf(str(vname))
+        weight = float(weight)
+        self._sources.append(uid)
+        self._targets.append(vid)
+        self._weights.append(weight)
+        if not self._directed:
+            self._sources.append(vid)
+            self._targets.append(uid)
+            self._weights.append(weight)
+
+    def build(self):
+        # counting sort of the edges by source, then one pass per row to drop
+        # repeated edges the way SimpleGraph does: first position, last weight
+        vertexCount = len(self._names)
+        counts = array('q', bytes(8 * (vertexCount + 1)))
+        for uid in self._sources:
+            counts[uid + 1] += 1
+        for vertexId in range(vertexCount):
+            counts[vertexId + 1] += counts[vertexId]
+        cursor = array('q', counts)
+        targets = array('i', bytes(4 * len(self._targets)))
+        weights = array('d', bytes(8 * len(self._weights)))
+        for uid, vid, weight in zip(self._sources, self._targets, self._weights):
+            targets[cursor[uid]] = vid
+            weights[cursor[uid]] = weight
+            cursor[uid] += 1
+        offsets = array('q', [0])
+        neighbours = array('i')
+        rowWeights = array('d')
+        for vertexId in range(vertexCount):
+            start, end = counts[vertexId], counts[vertexId + 1]
+            row = targets[start:end]
+            if len(set(row)) == len(row):
+                neighbours.extend(row)
+                rowWeights.extend(weights[start:end])
+            else:
+                latest = dict(zip(row, weights[start:end]))
+                neighbours.extend(latest.keys())
+                rowWeights.extend(latest.values())
+            offsets.append(len(neighbours))
+        if not any(rowWeights):
+            rowWeights = None
+        return CSRGraph(self._names, offsets, neighbours, rowWeights, self._directed)
+
+    def _idOf(self, name):
+        vertexId = self._ids.get(name)
+        if vertexId is None:
+            vertexId = self._ids[name] = len(self._names)
+            self._names.append(name)
+        return vertexId
+
+
+class _MappedNames:
+    # the vertex name table of a mapped graph; names are decoded on access
+    def __init__(self, nameTable, nameOffsets):
+        self._nameTable = nameTable
+        self._nameOffsets = nameOffsets
+
+    def encodedName(self, vertexId):
+        return self._nameTable[self._nameOffsets[vertexId]:self._nameOffsets[vertexId + 1]].tobytes()
+
+    def __getitem__(self, vertexId):
+        if not 0 <= vertexId < len(self):
+            raise IndexError("Vertex id out of range")
+        return self.encodedName(vertexId).decode()
+
+    def __iter__(self):
+        for vertexId in range(len(self)):
+            yield self.encodedName(vertexId).decode()
+
+    def __len__(self):
+        return len(self._nameOffsets) - 1
+
+
+class _MappedNameIds:
+    # name to id lookups by binary search over the ids sorted by name
+    def __init__(self, names, nameOrder):
+        self._names = names
+        self._nameOrder = nameOrder
+
+    def get(self, name, default=None):
+        encodedName = str(name).encode()
+        i = bisect_left(self._nameOrder, encodedName, key=self._names.encodedName)
+        if i < len(self._nameOrder) and self._names.encodedName(self._nameOrder[i]) == encodedName:
+            return self._nameOrder[i]
+        return default
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+    def __getitem__(self, name):
+        vertexId = self.get(name)
+        if vertexId is None:
+            raise KeyError(name)
+        return vertexId
+
+    def __len__(self):
+        return len(self._nameOrder)
+
+
+def _align(position, alignment=8):
+    return -(-position // alignment) * alignment
+
+
+def _asArray(typecode, values):
+    # arrays and typed views that already hold the right type are written as they are
+    if isinstance(values, array) and values.typecode == typecode:
+        return values
+    if isinstance(values, memoryview) and values.format == typecode:
+        return values
+    return array(typecode, values)
+
+
+# the shared adjacency a pool worker attached to in _attachSharedGraph
+_sharedGraph = None
+
+
+def _attachSharedGraph(offsetsName, neighboursName, vertexCount, neighbourCount):
+    global _sharedGraph
+    offsetsBlock = shared_memory.SharedMemory(offsetsName)
+    neighboursBlock = shared_memory.SharedMemory(neighboursName)
+    offsets = offsetsBlock.buf[:8 * (vertexCount + 1)].cast('q')
+    neighbours = neighboursBlock.buf[:4 * neighbourCount].cast('i')
+    # the blocks are kept alongside the views so they stay mapped
+    _sharedGraph = (offsetsBlock, neighboursBlock, offsets, neighbours, vertexCount)
+
+
+def _bfsDistances(offsets, neighbours, vertexCount, srcId):
+    # a level-synchronous BFS filling an array of hop counts, -1 meaning unreachable
+    distances = array('i', [-1]) * vertexCount
+    distances[srcId] = 0
+    frontier = [srcId]
+    depth = 0
+    while frontier:
+        depth += 1
+        nextFrontier = list()
+        for vertexId in frontier:
+            for neighbourId in neighbours[offsets[vertexId]:offsets[vertexId + 1]]:
+                if distances[neighbourId] < 0:
+                    distances[neighbourId] = depth
+                    nextFrontier.append(neighbourId)
+        frontier = nextFrontier
+    return distances
+
+
+def _sharedBfsBatch(sourceIds):
+    offsetsBlock, neighboursBlock, offsets, neighbours, vertexCount = _sharedGraph
+    return [_bfsDistances(offsets, neighbours, vertexCount, srcId).tobytes() for srcId in sourceIds]
+
+
+def iterEdgeFile(filename, workers=1, chunkSize=1 << 20, shardSize=1 << 24, weighted=None):
+    # streams (uname, vname, weight) triples from a whitespace separated edge
+    # list, one edge per line with an optional weight that defaults to 0;
+    # weighted=True requires the weight on every line and weighted=False
+    # rejects it. Blank lines and lines starting with '#' or '%' are skipped.
+    # Only one chunk is held at a time. With several workers, the file is cut
+    # into byte ranges that are parsed in separate processes.
+    if workers > 1:
+        yield from _iterEdgeShards(filename, workers, shardSize, weighted)
+        return
+    with open(filename, 'rb') as f:
+        remainder = b''
+        while True:
+            chunk = f.read(chunkSize)
+            if not chunk:
+                break
+            chunk = remainder + chunk
+            cut = chunk.rfind(b'\n') + 1
+            remainder = chunk[cut:]
+            yield from _parseEdgeLines(chunk[:cut], weighted)
+        yield from _parseEdgeLines(remainder, weighted)
+
+
+def _iterEdgeShards(filename, workers, shardSize, weighted):
+    fileSize = os.path.getsize(filename)
+    with ProcessPoolExecutor(workers) as executor:
+        pending = deque()
+        for start in range(0, fileSize, shardSize):
+            end = min(start + shardSize, fileSize)
+            pending.append(executor.submit(_parseEdgeRange, filename, start, end, weighted))
+            # a bounded window of shards keeps memory flat when the consumer is slower
+            if len(pending) > 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _parseEdgeLines(data, weighted=None):
+    edges = list()
+    for line in data.split(b'\n'):
+        fields = line.split()
+        if not fields or fields[0][:1] in (b'#', b'%'):
+            continue
+        if len(fields) == 2 and not weighted:
+            edges.append((fields[0].decode(), fields[1].decode(), 0))
+        elif len(fields) == 3 and weighted is not False:
+            edges.append((fields[0].decode(), fields[1].decode(), float(fields[2])))
+        elif weighted is None:
+            raise ValueError("An edge line must hold two vertex names and an optional weight: {!r}".format(
+                line.decode(errors='replace')))
+        else:
+            raise ValueError("An edge line must hold two vertex names (undirected) or two names and a weight "
+                             "(directed): {!r}".format(line.decode(errors='replace')))
+    return edges
+
+
+def _parseEdgeRange(filename, start, end, weighted=None):
+    # a shard owns every line that starts inside [start, end)
+    with open(filename, 'rb') as f:
+        if start > 0:
+            f.seek(start - 1)
+            f.readline()
+        position = f.tell()
+        if position >= end:
+            return list()
+        data = f.read(end - position)
+        if not data.endswith(b'\n'):
+            data += f.readline()
+        return _parseEdgeLines(data, weighted)
+
 
 def main():
     edgeList = [('A', 'B'), ('A', 'C'), ('B', 'D'),